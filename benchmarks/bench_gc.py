@@ -0,0 +1,74 @@
+"""Measure cyclic garbage collector pauses while game sessions are created, played and dropped.
+
+Run with: python -m benchmarks.bench_gc
+"""
+import contextlib
+import gc
+import io
+import random
+import time
+
+from game.control.gc import freeze_shared_world
+from game.text.vampire.game_controller import Vampire
+
+COMMANDS = ['look', 'get timepiece', 'e', 'get crate', 'w', 'drop all', 'get foo', 'undo', 'inventory', 'hit crate']
+
+
+class PauseRecorder:
+    def __init__(self):
+        super().__init__()
+        self.pauses = []
+        self.collected = 0
+        self._started = None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._started = time.perf_counter()
+        else:
+            self.pauses.append(time.perf_counter() - self._started)
+            self.collected += info['collected']
+
+    def __str__(self):
+        pauses = sorted(self.pauses) or [0.0]
+        p99 = pauses[min(len(pauses) - 1, int(len(pauses) * 0.99))]
+        return (
+            f'{len(self.pauses):5} collections, {sum(pauses) * 1000:8.2f} ms total, '
+            f'p99 {p99 * 1000:6.3f} ms, max {pauses[-1] * 1000:6.3f} ms, {self.collected} objects in cycles'
+        )
+
+
+def churn(sessions=5000, live=200, seed=0):
+    """Keep a window of live sessions, replacing a random one with a new session after every few turns.
+    """
+    randomizer = random.Random(seed)
+    games = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(sessions):
+            if len(games) >= live:
+                games.pop(randomizer.randrange(len(games))).close()
+            games.append(Vampire())
+            for game in randomizer.sample(games, min(len(games), 5)):
+                game.try_take_turn(randomizer.choice(COMMANDS))
+
+
+def measure(name):
+    recorder = PauseRecorder()
+    gc.collect()
+    gc.callbacks.append(recorder)
+    try:
+        churn()
+    finally:
+        gc.callbacks.remove(recorder)
+    print(f'{name:10} {recorder}')
+
+
+def main():
+    measure('unfrozen')
+    with contextlib.redirect_stdout(io.StringIO()):
+        freeze_shared_world(Vampire)
+    measure('frozen')
+    gc.unfreeze()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Compare the cost of failing commands through the outcome API and through the raising take_turn wrapper.
+
+Run with: python -m benchmarks.bench_outcomes
+"""
+import contextlib
+import io
+import timeit
+
+from game.text.things import GameError
+from game.text.vampire.game_controller import Vampire
+
+FAILING_COMMANDS = ['get foo', 'xyzzy', 'get sign', 'go north', 'drop timepiece', 'redo']
+SUCCEEDING_COMMANDS = ['look', 'inventory', 'look at sign']
+
+
+def try_take_turns(game, commands):
+    for text_input in commands:
+        game.try_take_turn(text_input)
+
+
+def take_turns(game, commands):
+    for text_input in commands:
+        try:
+            game.take_turn(text_input)
+        except GameError:
+            pass
+
+
+def main(number=20000):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Vampire()
+    for commands_name, commands in [('failing', FAILING_COMMANDS), ('succeeding', SUCCEEDING_COMMANDS)]:
+        for name, turns in [('try_take_turn', try_take_turns), ('take_turn', take_turns)]:
+            seconds = min(timeit.repeat(lambda: turns(game, commands), number=number, repeat=5))
+            print(f'{commands_name:10} {name:13} {seconds / (number * len(commands)) * 1e9:8.1f} ns/command')
+
+
+if __name__ == '__main__':
+    main()
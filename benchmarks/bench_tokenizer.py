@@ -0,0 +1,29 @@
+"""Compare the cost of tokenizing typical commands with SimplePhrase and ScannedPhrase.
+
+Run with: python -m benchmarks.bench_tokenizer
+"""
+import timeit
+
+from game.text.grammars import ScannedPhrase, SimplePhrase
+
+COMMANDS = ['e', 'look', 'get crate', 'Look at the Sign', '  drop   the timepiece  ', 'hit brick fireplace', 'xyzzy']
+
+
+def tokenize_simple():
+    for text_input in COMMANDS:
+        SimplePhrase(text_input.lower().strip())
+
+
+def tokenize_scanned():
+    for text_input in COMMANDS:
+        ScannedPhrase(text_input)
+
+
+def main(number=100000):
+    for name, tokenize in [('SimplePhrase', tokenize_simple), ('ScannedPhrase', tokenize_scanned)]:
+        seconds = min(timeit.repeat(tokenize, number=number, repeat=5))
+        print(f'{name:14} {seconds / (number * len(COMMANDS)) * 1e9:8.1f} ns/command')
+
+
+if __name__ == '__main__':
+    main()
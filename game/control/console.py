@@ -1,7 +1,6 @@
 import sys
 
 from game.text.results import ResultSuccess
-from game.text.text_games import GameError
 from game.text.vampire.game_controller import Vampire
 
 
@@ -38,14 +37,13 @@ class Console:
     def event_loop(self):
         while not self.text_game.is_ended:
             self.output('\n\nWhat do you want to do? ')
-            text = self.input()
-            if self.controller_action(text):
-                self.text_game.start_turn()
-                try:
-                    result = self.text_game.take_turn(text)
-                    self.output('\n' + str(result))
-                except GameError as thing_error:
-                    self.output('\n' + str(thing_error))
+            self.handle(self.input())
+
+    def handle(self, text: str):
+        if self.controller_action(text):
+            self.text_game.start_turn()
+            outcome = self.text_game.try_take_turn(text)
+            self.output('\n' + outcome.message)
 
     def controller_action(self, text: str):
         if text.startswith('quit'):
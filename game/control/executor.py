@@ -0,0 +1,220 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from game.control.gc import freeze_shared_world
+from game.text.deltas import StateTracker
+
+TurnReply = namedtuple('TurnReply', ['session_id', 'status', 'message'])
+DeltaReply = namedtuple('DeltaReply', ['session_id', 'status', 'delta', 'message'])
+
+
+def _serve(connection, game_factory):
+    """Run the sessions of one shard, answering requests from the executor in the order they arrive.
+    """
+    freeze_shared_world(game_factory)
+    games, trackers = {}, {}
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        kind, session_id, payload = request
+        if kind == 'turn':
+            game = games.get(session_id)
+            if game is None:
+                game = games[session_id] = game_factory()
+            outcome = game.try_take_turn(payload)
+            connection.send(TurnReply(session_id, int(outcome.status), outcome.message))
+        elif kind == 'delta':
+            game = games.get(session_id)
+            if game is None:
+                game = games[session_id] = game_factory()
+            tracker = trackers.get(session_id)
+            if tracker is None:
+                tracker = trackers[session_id] = StateTracker(game)
+            outcome = game.try_take_turn(payload)
+            message = outcome.message
+            if outcome.is_success and message == tracker.describe():
+                message = None
+            connection.send(DeltaReply(session_id, int(outcome.status), tracker.delta().to_dict(), message))
+        elif kind == 'describe':
+            game = games.get(session_id)
+            connection.send(None if game is None else game.player.location.description)
+        elif kind == 'export':
+            trackers.pop(session_id, None)
+            game = games.pop(session_id, None)
+            connection.send(None if game is None else game.export_state())
+            if game is not None:
+                game.close()
+        elif kind == 'import':
+            trackers.pop(session_id, None)
+            game = games[session_id] = game_factory()
+            game.import_state(payload)
+            connection.send(None)
+    connection.close()
+
+
+class Worker:
+    def __init__(self, worker_id: int, game_factory):
+        super().__init__()
+        self.worker_id = worker_id
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(worker_connection, game_factory), daemon=True)
+        self.process.start()
+        worker_connection.close()
+        self.lock = threading.Lock()
+
+    def request(self, kind, session_id, payload=None):
+        with self.lock:
+            return self.exchange(kind, session_id, payload)
+
+    def exchange(self, kind, session_id, payload=None):
+        """Send a request and return its reply, the caller holding the lock of this worker.
+        """
+        self.connection.send((kind, session_id, payload))
+        return self.connection.recv()
+
+    def stop(self):
+        with self.lock:
+            self.connection.send(None)
+        self.process.join()
+        self.connection.close()
+
+
+class ShardedExecutor:
+    """Runs game sessions on a pool of worker processes, each session always on the worker that owns it.
+
+    Sessions are assigned by rendezvous hashing, so adding or removing a worker only moves the sessions
+    that worker gains or loses. Commands of one session reach its worker through one pipe, which keeps
+    them in order, while sessions on different workers run in parallel.
+
+    A session only changes owner while the locks of both its old and new worker are held. Requests check
+    the owner again once they hold the lock of the worker they resolved, and resolve it again if the
+    session moved meanwhile, so no request reaches a worker that no longer has its session.
+    """
+
+    def __init__(self, game_factory: Callable[[], 'TextGameSinglePlayer'], workers: int=None):
+        super().__init__()
+        self.game_factory = game_factory
+        self.workers: Dict[int, Worker] = {}
+        self.owners: Dict[str, int] = {}
+        self._next_worker_id = 0
+        self._lock = threading.Lock()
+        for _ in range(workers or os.cpu_count() or 1):
+            self._start_worker()
+
+    @staticmethod
+    def _weight(session_id: str, worker_id: int) -> bytes:
+        return hashlib.blake2b(f'{worker_id}:{session_id}'.encode('utf-8'), digest_size=8).digest()
+
+    def owner_of(self, session_id: str) -> int:
+        return max(self.workers, key=lambda worker_id: self._weight(session_id, worker_id))
+
+    def _worker_for(self, session_id: str) -> Worker:
+        with self._lock:
+            worker_id = self.owners.get(session_id)
+            if worker_id is None:
+                worker_id = self.owners[session_id] = self.owner_of(session_id)
+            return self.workers[worker_id]
+
+    def _request(self, kind, session_id: str, payload=None):
+        while True:
+            worker = self._worker_for(session_id)
+            with worker.lock:
+                if self.owners.get(session_id) == worker.worker_id:
+                    return worker.exchange(kind, session_id, payload)
+
+    def take_turn(self, session_id: str, text_input) -> TurnReply:
+        return self._request('turn', session_id, text_input)
+
+    def take_turn_delta(self, session_id: str, text_input) -> DeltaReply:
+        """Take a turn and reply with what changed in the view of the session, instead of the full text.
+
+        The message is left out when it is only the description of the place, which the client renders
+        from its own view; the first reply of a session, and the first after it moved worker, hold the
+        whole view.
+        """
+        return self._request('delta', session_id, text_input)
+
+    def describe(self, session_id: str) -> str:
+        """Return the full text description of where the player of the session is.
+        """
+        return self._request('describe', session_id)
+
+    def take_turns(self, commands: Iterable[Tuple[str, str]], window: int=64) -> List[TurnReply]:
+        """Run (session id, text input) commands, dispatching each window of them to every worker before collecting replies.
+
+        The window bounds how many replies can wait in a pipe, so neither side blocks on a full pipe.
+        """
+        commands = list(commands)
+        replies = []
+        for start in range(0, len(commands), window):
+            replies.extend(self._take_window(commands[start:start + window]))
+        return replies
+
+    def _take_window(self, commands: List[Tuple[str, str]]) -> List[TurnReply]:
+        while True:
+            workers = [self._worker_for(session_id) for session_id, _ in commands]
+            locked = sorted(set(workers), key=lambda worker: worker.worker_id)
+            for worker in locked:
+                worker.lock.acquire()
+            try:
+                if all(self.owners.get(session_id) == worker.worker_id
+                       for worker, (session_id, _) in zip(workers, commands)):
+                    for worker, (session_id, text_input) in zip(workers, commands):
+                        worker.connection.send(('turn', session_id, text_input))
+                    return [worker.connection.recv() for worker in workers]
+            finally:
+                for worker in locked:
+                    worker.lock.release()
+
+    def _start_worker(self) -> Worker:
+        worker = Worker(self._next_worker_id, self.game_factory)
+        self.workers[worker.worker_id] = worker
+        self._next_worker_id += 1
+        return worker
+
+    def add_worker(self) -> int:
+        """Start another worker and move to it the sessions it now owns.
+        """
+        with self._lock:
+            worker = self._start_worker()
+            self._rebalance()
+            return worker.worker_id
+
+    def remove_worker(self, worker_id: int):
+        """Move the sessions of the given worker to their new owners and stop it.
+        """
+        with self._lock:
+            worker = self.workers.pop(worker_id)
+            for session_id in [session_id for session_id, owner in self.owners.items() if owner == worker_id]:
+                self._migrate(session_id, worker)
+            worker.stop()
+
+    def _rebalance(self):
+        for session_id, worker_id in list(self.owners.items()):
+            if self.owner_of(session_id) != worker_id:
+                self._migrate(session_id, self.workers[worker_id])
+
+    def _migrate(self, session_id: str, from_worker: Worker):
+        to_worker = self.workers[self.owner_of(session_id)]
+        locked = sorted({from_worker, to_worker}, key=lambda worker: worker.worker_id)
+        for worker in locked:
+            worker.lock.acquire()
+        try:
+            state = from_worker.exchange('export', session_id)
+            if state is not None:
+                to_worker.exchange('import', session_id, state)
+            self.owners[session_id] = to_worker.worker_id
+        finally:
+            for worker in locked:
+                worker.lock.release()
+
+    def close(self):
+        with self._lock:
+            for worker in self.workers.values():
+                worker.stop()
+            self.workers.clear()
@@ -0,0 +1,14 @@
+import gc
+from typing import Callable
+
+
+def freeze_shared_world(game_factory: Callable[[], 'TextGameSinglePlayer']=None):
+    """Move every object alive now, such as modules, classes and shared directions, out of the cyclic GC's reach.
+
+    Building and closing one game first loads whatever games share lazily. Collections after the freeze
+    only scan the objects of sessions created later.
+    """
+    if game_factory is not None:
+        game_factory().close()
+    gc.collect()
+    gc.freeze()
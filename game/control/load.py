@@ -0,0 +1,139 @@
+import argparse
+import contextlib
+import io
+import math
+import random
+import time
+from typing import Callable, Dict, List
+
+from game.control.console import Console
+from game.text.vampire.game_controller import Vampire
+
+DEFAULT_MIX = {'move': 40, 'look': 20, 'get': 15, 'drop': 10, 'invalid': 15}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of the given sorted values, with at least that fraction at or under it.
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class LoadReport:
+    """Throughput and turn latency percentiles of one interval of a load run.
+    """
+    def __init__(self, elapsed: float, seconds: float, latencies: List[float]):
+        super().__init__()
+        latencies = sorted(latencies)
+        self.elapsed = elapsed
+        self.turns = len(latencies)
+        self.throughput = self.turns / seconds if seconds > 0 else 0.0
+        self.p50 = percentile(latencies, 0.50)
+        self.p99 = percentile(latencies, 0.99)
+
+    def __str__(self):
+        return (
+            f'{self.elapsed:7.1f}s {self.turns:8} turns {self.throughput:10.0f} turns/s '
+            f'p50 {self.p50 * 1e6:8.1f} us p99 {self.p99 * 1e6:8.1f} us'
+        )
+
+
+class SimulatedPlayer:
+    """Sends a random mix of moves, looks, gets, drops and invalid words to one game session.
+    """
+    directions = ['e', 'w', 'n', 's', 'east', 'west', 'go east', 'go west']
+    invalid_words = ['xyzzy', 'plugh', 'get foo', 'eat crate', '', 'fly north']
+
+    def __init__(self, send: Callable[[str], object], items: List[str], mix: Dict[str, int], generator: random.Random):
+        super().__init__()
+        self.send = send
+        self.items = items
+        self.kinds = list(mix)
+        self.weights = list(mix.values())
+        self.random = generator
+
+    def next_command(self) -> str:
+        kind = self.random.choices(self.kinds, self.weights)[0]
+        if kind == 'move':
+            return self.random.choice(self.directions)
+        if kind == 'look':
+            return self.random.choice(['look', f'look {self.random.choice(self.items)}'])
+        if kind in ('get', 'drop'):
+            return f'{kind} {self.random.choice(self.items)}'
+        return self.random.choice(self.invalid_words)
+
+
+class LoadGenerator:
+    """Drives many simulated players against the engine and reports throughput and latency over time.
+
+    With the 'game' target each player sends commands straight to try_take_turn of its own game; with
+    the 'console' target they go through the console command handling, output included.
+
+    Players take their turns one after another on the calling thread, so reports measure the latency and
+    throughput of one thread running many sessions; they do not exercise concurrent sessions.
+    """
+
+    def __init__(self, players: int=100, target: str='game', mix: Dict[str, int]=None, seed: int=0):
+        super().__init__()
+        generator = random.Random(seed)
+        self.players = []
+        self.total = None
+        with contextlib.redirect_stdout(io.StringIO()):   # the game dumps its places when created
+            games = [Vampire() for _ in range(players)]
+        items = sorted({
+            item.name.split()[0].lower() for place in games[0].places.values() for item in place.inventory
+        })
+        for game in games:
+            send = self.create_session(game, target)
+            self.players.append(SimulatedPlayer(send, items, mix or DEFAULT_MIX, generator))
+
+    @staticmethod
+    def create_session(game, target: str) -> Callable[[str], object]:
+        if target == 'game':
+            return game.try_take_turn
+        if target == 'console':
+            console = Console(game)
+            console.output = lambda message: None
+            return console.handle
+        raise ValueError(f'Unknown target {target}. Valid targets are: game, console')
+
+    def run(self, seconds: float, interval: float=1.0, report: Callable[[LoadReport], None]=None) -> List[LoadReport]:
+        """Run the load for the given duration, reporting each interval, and return the interval reports.
+        """
+        reports = []
+        start = interval_start = time.perf_counter()
+        latencies, all_latencies = [], []
+        while True:
+            for player in self.players:
+                command = player.next_command()
+                turn_start = time.perf_counter()
+                player.send(command)
+                latencies.append(time.perf_counter() - turn_start)
+            now = time.perf_counter()
+            if now - interval_start >= interval or now - start >= seconds:
+                reports.append(LoadReport(now - start, now - interval_start, latencies))
+                if report is not None:
+                    report(reports[-1])
+                all_latencies.extend(latencies)
+                interval_start, latencies = now, []
+            if now - start >= seconds:
+                self.total = LoadReport(now - start, now - start, all_latencies)
+                return reports
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Generate simulated player load against the game engine.')
+    parser.add_argument('--players', type=int, default=100)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--interval', type=float, default=1.0)
+    parser.add_argument('--target', choices=['game', 'console'], default='game')
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args(args)
+    generator = LoadGenerator(players=options.players, target=options.target, seed=options.seed)
+    generator.run(options.seconds, options.interval, report=print)
+    print(f'total   {generator.total}')
+
+
+if __name__ == '__main__':
+    main()
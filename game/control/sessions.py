@@ -0,0 +1,116 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from game.text.results import Outcome
+
+
+class SessionStoreStats:
+    def __init__(self):
+        self.hits = 0
+        self.rehydrations = 0
+        self.creations = 0
+        self.hibernations = 0
+        self.rehydration_seconds = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.rehydrations + self.creations
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def mean_rehydration_seconds(self) -> float:
+        return self.rehydration_seconds / self.rehydrations if self.rehydrations else 0.0
+
+    def __str__(self):
+        return (
+            f'hit rate {self.hit_rate:.1%}, {self.rehydrations} rehydrations '
+            f'({self.mean_rehydration_seconds * 1000:.2f} ms mean), {self.hibernations} hibernations'
+        )
+
+
+class SessionStore:
+    """Keeps the most recently used game sessions in memory and hibernates the others to a SQLite database.
+
+    A command for a hibernated session transparently rebuilds it from its saved state. The saved state
+    is the one export_state returns, so a rehydrated session starts with an empty undo history. The
+    journal and telemetry log given to the store, if any, are attached to every session it creates or
+    rehydrates, under the id of the session.
+    """
+
+    def __init__(self, game_factory: Callable[[], 'TextGameSinglePlayer'], path=':memory:', max_sessions: int=1000,
+                 journal=None, telemetry=None):
+        super().__init__()
+        if max_sessions < 1:
+            raise ValueError(f'max_sessions must be at least 1, not {max_sessions}')
+        self.game_factory = game_factory
+        self.max_sessions = max_sessions
+        self.journal = journal
+        self.telemetry = telemetry
+        self.games = OrderedDict()
+        self.stats = SessionStoreStats()
+        self.database = sqlite3.connect(path)
+        self.database.execute('CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, state TEXT NOT NULL)')
+
+    def __len__(self):
+        return len(self.games)
+
+    def __contains__(self, session_id):
+        return session_id in self.games
+
+    def get(self, session_id: str) -> 'TextGameSinglePlayer':
+        """Return the game of the given session, rehydrating or creating it when it is not in memory.
+        """
+        game = self.games.get(session_id)
+        if game is not None:
+            self.games.move_to_end(session_id)
+            self.stats.hits += 1
+            return game
+        row = self.database.execute('SELECT state FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None:
+            game = self.game_factory()
+            self.stats.creations += 1
+        else:
+            start = time.perf_counter()
+            game = self.game_factory()
+            game.import_state(json.loads(row[0]))
+            with self.database:
+                self.database.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+            self.stats.rehydrations += 1
+            self.stats.rehydration_seconds += time.perf_counter() - start
+        if self.journal is not None:
+            game.attach_journal(self.journal, session_id)
+        if self.telemetry is not None:
+            game.attach_telemetry(self.telemetry, session_id)
+        self.games[session_id] = game
+        self.evict()
+        return game
+
+    def try_take_turn(self, session_id: str, text_input) -> Outcome:
+        return self.get(session_id).try_take_turn(text_input)
+
+    def evict(self):
+        """Hibernate the least recently used sessions until the count budget is met.
+        """
+        while len(self.games) > self.max_sessions:
+            session_id, game = self.games.popitem(last=False)
+            self.hibernate(session_id, game)
+
+    def hibernate(self, session_id: str, game: 'TextGameSinglePlayer'):
+        with self.database:
+            self.database.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, state) VALUES (?, ?)',
+                (session_id, json.dumps(game.export_state())),
+            )
+        game.close()
+        self.stats.hibernations += 1
+
+    def close(self):
+        """Hibernate every session still in memory and close the database.
+        """
+        while self.games:
+            session_id, game = self.games.popitem(last=False)
+            self.hibernate(session_id, game)
+        self.database.close()
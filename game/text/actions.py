@@ -4,11 +4,14 @@ from game.text.things import (
     ActionOnItemError,
     ActionRequiresItemInLocationError,
     ActionRequiresItemPossessionError,
+    ActionableThing,
     Direction,
     Item,
+    Place,
     Player,
     Result,
 )
+from game.text.results import Refusal
 
 
 class GetActionItemIsFixedInPlace(ActionOnItemError):
@@ -21,17 +24,25 @@ class GoActionItemNoConnectionToDestination(ActionError):
         return "You can't go there"
 
 
+def describe(description: str) -> Result:
+    if description is None:
+        description = 'You see nothing special'
+    return Result(description)
+
+
+def look_around(player: Player) -> Result:
+    """Return what the player sees when looking around the location, shared by looking and by arriving somewhere.
+    """
+    return describe(player.scope.description)
+
+
 class LookAction(Action):
 
     def __init__(self, item: Item=None):
         def look(player: Player) -> Result:
             if item is None:
-                description = player.location.description
-            else:
-                description = item.description
-            if description is None:
-                description = 'You see nothing special'
-            return Result(description)
+                return look_around(player)
+            return describe(item.description)
         super().__init__(strategy=look, item=item, aliases=['read'])
 
 
@@ -40,18 +51,24 @@ class GetAction(Action):
     def __init__(self, item: Item):
         def get(player: Player) -> Result:
             player.get(item)
+            player.announce(f'takes the {item.name}')
             return Result(f'OK, you got the {item.name}')
         super().__init__(strategy=get, item=item)
 
-    def validate_player_can_execute(self, player: Player):
-        if player.has(self.item):
-            raise ActionRequiresItemInLocationError(self.item)
-        try:
-            super().validate_player_can_execute(player)
-        except ActionRequiresItemPossessionError:
-            pass
-        if self.item.is_fixed:
-            raise GetActionItemIsFixedInPlace(self.item)
+    @classmethod
+    def item_refusal(cls, player: Player, item: Item):
+        if player.has(item):
+            return Refusal(ActionRequiresItemInLocationError, item)
+        refusal = super().item_refusal(player, item)
+        if refusal is not None and refusal.error_type is ActionRequiresItemPossessionError:
+            refusal = None
+            if item.must_be_in_location and not player.sees(item):
+                refusal = Refusal(ActionRequiresItemInLocationError, item)
+        if refusal is not None:
+            return refusal
+        if item.is_fixed:
+            return Refusal(GetActionItemIsFixedInPlace, item)
+        return None
 
 
 class DropAction(Action):
@@ -59,13 +76,126 @@ class DropAction(Action):
     def __init__(self, item: Item):
         def drop(player: Player) -> Result:
             player.drop(item)
+            player.announce(f'drops the {item.name}')
             return Result(f'The {item.name} is on the {player.location.name} floor')
         super().__init__(strategy=drop, item=item)
 
-    def validate_player_can_execute(self, player: Player):
-        if not player.has(self.item):
-            raise ActionRequiresItemPossessionError(self.item)
-        super().validate_player_can_execute(player)
+    @classmethod
+    def item_refusal(cls, player: Player, item: Item):
+        if not player.has(item):
+            return Refusal(ActionRequiresItemPossessionError, item)
+        return super().item_refusal(player, item)
+
+
+class BulkResult(Result):
+    """Result of an action on many items, reporting the result or error of each item on its own line.
+    """
+    def __init__(self, results_by_item):
+        super().__init__('\n'.join(f'{item.name}: {result}' for item, result in results_by_item))
+        self.results_by_item = results_by_item
+
+
+class BulkActionError(ActionError):
+    """Error of an action on many items that could act on none of them, reporting the error of each item.
+    """
+    def __init__(self, result: BulkResult):
+        super().__init__()
+        self.result = result
+
+    def __str__(self):
+        return str(self.result)
+
+
+class GetAllActionNothingToGet(ActionError):
+    def __str__(self):
+        return 'There is nothing here'
+
+
+class DropAllActionNothingToDrop(ActionError):
+    def __str__(self):
+        return 'You are not carrying anything'
+
+
+def get_all_results(player: Player):
+    """Return the result of getting each item in the location of the player, and the items that can be gotten.
+    """
+    results_by_item, items = [], []
+    for item in player.location.inventory:
+        refusal = GetAction.item_refusal(player, item)
+        if refusal is None:
+            items.append(item)
+            result = f'OK, you got the {item.name}'
+        else:
+            result = refusal.message
+        results_by_item.append((item, result))
+    return results_by_item, items
+
+
+def drop_all_results(player: Player):
+    """Return the result of dropping each item the player carries, and the items that can be dropped.
+    """
+    results_by_item, items = [], []
+    for item in player.inventory:
+        refusal = DropAction.item_refusal(player, item)
+        if refusal is None:
+            items.append(item)
+            result = f'The {item.name} is on the {player.location.name} floor'
+        else:
+            result = refusal.message
+        results_by_item.append((item, result))
+    return results_by_item, items
+
+
+class GetAllAction(Action):
+
+    def __init__(self, place: Place=None):
+        def get(player: Player) -> Result:
+            results_by_item, items = get_all_results(player)
+            player.get_items(items)
+            if items:
+                player.announce('takes the ' + ', '.join(item.name for item in items))
+            return BulkResult(results_by_item)
+        super().__init__(strategy=get, item=None)
+        self.place = place
+
+    def refusal(self, player: Player):
+        if self.place is not None and player.location is not self.place:
+            return Refusal(ActionRequiresItemInLocationError, self.place)
+        if len(player.location.items) == 0:
+            return Refusal(GetAllActionNothingToGet)
+        if all(GetAction.item_refusal(player, item) is not None for item in player.location.inventory):
+            return Refusal(BulkActionError, BulkResult(get_all_results(player)[0]))
+        return super().refusal(player)
+
+
+class DropAllAction(Action):
+
+    def __init__(self):
+        def drop(player: Player) -> Result:
+            results_by_item, items = drop_all_results(player)
+            player.drop_items(items)
+            if items:
+                player.announce('drops the ' + ', '.join(item.name for item in items))
+            return BulkResult(results_by_item)
+        super().__init__(strategy=drop, item=None)
+
+    def refusal(self, player: Player):
+        if len(player.items) == 0:
+            return Refusal(DropAllActionNothingToDrop)
+        if all(DropAction.item_refusal(player, item) is not None for item in player.inventory):
+            return Refusal(BulkActionError, BulkResult(drop_all_results(player)[0]))
+        return super().refusal(player)
+
+
+class AllItems(ActionableThing):
+    """Stands for every item in reach, as in "get all" and "drop all".
+    """
+    def __init__(self):
+        super().__init__(game=None, name='All', aliases=['Everything'])
+
+    @property
+    def _actions(self):
+        return [GetAllAction(), DropAllAction()]
 
 
 class InventoryAction(Action):
@@ -79,15 +209,69 @@ class InventoryAction(Action):
         super().__init__(strategy=inventory, item=None)
 
 
+class UndoActionNothingToUndo(ActionError):
+    def __str__(self):
+        return 'There is nothing to undo'
+
+
+class RedoActionNothingToRedo(ActionError):
+    def __str__(self):
+        return 'There is nothing to redo'
+
+
+class UndoAction(Action):
+    is_recorded = False
+
+    def __init__(self):
+        def undo(player: Player) -> Result:
+            command = player.game.history.last_command
+            player.game.history.undo()
+            return Result(f'OK, undid "{command}"')
+        super().__init__(strategy=undo, item=None)
+
+    def places_touched(self, player: Player):
+        return None
+
+    def refusal(self, player: Player):
+        if not player.game.history.can_undo:
+            return Refusal(UndoActionNothingToUndo)
+        return super().refusal(player)
+
+
+class RedoAction(Action):
+    is_recorded = False
+
+    def __init__(self):
+        def redo(player: Player) -> Result:
+            player.game.history.redo()
+            return Result(f'OK, redid "{player.game.history.last_command}"')
+        super().__init__(strategy=redo, item=None)
+
+    def places_touched(self, player: Player):
+        return None
+
+    def refusal(self, player: Player):
+        if not player.game.history.can_redo:
+            return Refusal(RedoActionNothingToRedo)
+        return super().refusal(player)
+
+
 class GoAction(Action):
 
-    def __init__(self, direction: Direction):
+    def __init__(self, direction: Direction, name=None, aliases=None):
         def go(player: Player) -> Result:
-            destination = player.location.get_exit_destination(direction)
-            if destination is not None:
-                player.location = player.location.get_exit_destination(direction)
-#TODO: next action is Look... or just hardcode that here?
-                return LookAction().execute(player=player)
-            else:
-                raise GoActionItemNoConnectionToDestination()
-        super().__init__(strategy=go, item=None)
+            player.move_to(player.scope.get_exit_destination(direction))
+            return look_around(player)
+        super().__init__(strategy=go, item=None, aliases=aliases, name=name)
+        self.direction = direction
+
+    def places_touched(self, player: Player):
+        destination = player.scope.get_exit_destination(self.direction)
+        if destination is None:
+            return [player.location]
+        return [player.location, destination]
+
+    def refusal(self, player: Player):
+        if player.scope.get_exit_destination(self.direction) is None:
+            return Refusal(GoActionItemNoConnectionToDestination)
+        return super().refusal(player)
@@ -0,0 +1,154 @@
+from collections import namedtuple
+from typing import Dict, List
+
+import numpy
+
+from game.text.actions import (
+    DropAction, DropAllAction, GetAction, GetAllAction, GoAction, InventoryAction, LookAction,
+)
+from game.text.things import Place
+
+
+BatchObservation = namedtuple('BatchObservation', ['succeeded', 'location', 'placement'])
+
+
+class BatchSimulation:
+    """Many sessions of one game stepped in lockstep, with the world compiled into integer arrays.
+
+    Containers are numbered as in the game's item containers, the player being container 0, and every
+    session is a row: the container the player is in, and the container each item is in. A step applies
+    one command per session with array operations over the whole batch, following the preconditions and
+    effects of the reference actions. Only commands whose actions are moves, gets, drops and looks are
+    compiled; the rest of the vocabulary is left out of `commands`.
+    """
+    NO_CHANGE, LOOK_AT, MOVE, GET, DROP, GET_ALL, DROP_ALL = range(7)
+
+    def __init__(self, game, sessions: int):
+        super().__init__()
+        self.sessions = sessions
+        self.containers = list(game.item_containers)
+        self.container_numbers = {container: number for number, container in enumerate(self.containers)}
+        self.items = [item for container in self.containers for item in container.inventory]
+        self.item_numbers = {item: number for number, item in enumerate(self.items)}
+        self.is_fixed = numpy.array([item.is_fixed for item in self.items], dtype=bool)
+        self.must_possess = numpy.array([item.must_possess for item in self.items], dtype=bool)
+        self.must_be_in_location = numpy.array([item.must_be_in_location for item in self.items], dtype=bool)
+        self.directions = []
+        self.commands: List[str] = []
+        kinds, arguments = [], []
+        for command, action in game.grammar.vocabulary():
+            compiled = self.compile_action(action)
+            if compiled is not None:
+                self.commands.append(command)
+                kinds.append(compiled[0])
+                arguments.append(compiled[1])
+        self.command_numbers: Dict[str, int] = {command: number for number, command in enumerate(self.commands)}
+        self.kinds = numpy.array(kinds, dtype=numpy.int8)
+        self.arguments = numpy.array(arguments, dtype=numpy.int32)
+        self.exits = numpy.full((len(self.containers), max(len(self.directions), 1)), -1, dtype=numpy.int32)
+        for container, number in self.container_numbers.items():
+            if isinstance(container, Place):
+                for direction_number, direction in enumerate(self.directions):
+                    destination = container.get_exit_destination(direction)
+                    if destination is not None:
+                        self.exits[number, direction_number] = self.container_numbers[destination]
+        self.initial_location = self.container_numbers[game.player.location]
+        self.initial_placement = numpy.empty(len(self.items), dtype=numpy.int32)
+        for container, number in self.container_numbers.items():
+            for item in container.inventory:
+                self.initial_placement[self.item_numbers[item]] = number
+        self.location = None
+        self.placement = None
+        self.reset()
+
+    def compile_action(self, action):
+        """Return the kind and argument of the given action, or None if the batch cannot simulate it.
+        """
+        kind = type(action)
+        if kind is GoAction:
+            if action.direction not in self.directions:
+                self.directions.append(action.direction)
+            return self.MOVE, self.directions.index(action.direction)
+        if kind is InventoryAction or (kind is LookAction and action.item is None):
+            return self.NO_CHANGE, -1
+        if kind is GetAllAction and action.place is None:
+            return self.GET_ALL, -1
+        if kind is DropAllAction:
+            return self.DROP_ALL, -1
+        item_number = self.item_numbers.get(action.item)
+        if item_number is None:
+            return None
+        kinds_by_action = {LookAction: self.LOOK_AT, GetAction: self.GET, DropAction: self.DROP}
+        if kind in kinds_by_action:
+            return kinds_by_action[kind], item_number
+        return None
+
+    def reset(self):
+        """Put every session back in the starting state of the game.
+        """
+        self.location = numpy.full(self.sessions, self.initial_location, dtype=numpy.int32)
+        self.placement = numpy.tile(self.initial_placement, (self.sessions, 1))
+
+    def step(self, commands) -> BatchObservation:
+        """Execute the command with the given number in each session, returning which succeeded and the new state.
+        """
+        commands = numpy.asarray(commands)
+        kinds, arguments = self.kinds[commands], self.arguments[commands]
+        rows = numpy.arange(self.sessions)
+        location, placement = self.location, self.placement
+
+        is_move = kinds == self.MOVE
+        item = numpy.where(is_move, 0, numpy.maximum(arguments, 0))
+        direction = numpy.where(is_move, arguments, 0)
+        item_placement = placement[rows, item]
+        carries = item_placement == 0
+        in_location = item_placement == location
+        must_possess = self.must_possess[item]
+        must_be_in_location = self.must_be_in_location[item]
+        is_fixed = self.is_fixed[item]
+        item_error = (must_possess & ~carries) | (~must_possess & must_be_in_location & ~in_location)
+
+        destination = self.exits[location, direction]
+        gettable_all = (placement == location[:, None]) & ~self.is_fixed
+        droppable_all = (placement == 0) & ~(~self.must_possess & self.must_be_in_location)
+
+        failed = numpy.select(
+            [
+                kinds == self.LOOK_AT,
+                is_move,
+                kinds == self.GET,
+                kinds == self.DROP,
+                kinds == self.GET_ALL,
+                kinds == self.DROP_ALL,
+            ],
+            [
+                item_error,
+                destination < 0,
+                carries | (must_be_in_location & ~in_location) | is_fixed,
+                ~carries | (~must_possess & must_be_in_location),
+                ~gettable_all.any(axis=1),
+                ~droppable_all.any(axis=1),
+            ],
+            default=False,
+        )
+        succeeded = ~failed
+
+        moved = succeeded & is_move
+        got = succeeded & (kinds == self.GET)
+        dropped = succeeded & (kinds == self.DROP)
+        placement[rows[got], item[got]] = 0
+        placement[rows[dropped], item[dropped]] = location[dropped]
+        got_all = (succeeded & (kinds == self.GET_ALL))[:, None] & gettable_all
+        dropped_all = (succeeded & (kinds == self.DROP_ALL))[:, None] & droppable_all
+        placement[got_all] = 0
+        placement[dropped_all] = numpy.broadcast_to(location[:, None], placement.shape)[dropped_all]
+        location[moved] = destination[moved]
+        return BatchObservation(succeeded, location.copy(), placement.copy())
+
+    def export_state(self, session: int) -> dict:
+        """Return the state of the given session as plain data, like the game's export_state.
+        """
+        items = {container.name: [] for container in self.containers}
+        for item, container in zip(self.items, self.placement[session]):
+            items[self.containers[container].name].append(item.name)
+        return {'location': self.containers[self.location[session]].name, 'items': items}
@@ -0,0 +1,96 @@
+from typing import FrozenSet, List, Optional
+
+from game.text.things import Place, Player
+
+
+class StateDelta:
+    """What changed in the view of one player since the state was last sent to its client.
+
+    When `place` is set the player is somewhere else: the client drops its view of the previous place,
+    and the items and exits of the new place are all listed as added.
+    """
+    __slots__ = (
+        'place', 'items_added', 'items_removed', 'inventory_added', 'inventory_removed',
+        'exits_added', 'exits_removed', 'clock',
+    )
+
+    def __init__(self):
+        self.place: Optional[str] = None
+        self.items_added: List[str] = []
+        self.items_removed: List[str] = []
+        self.inventory_added: List[str] = []
+        self.inventory_removed: List[str] = []
+        self.exits_added: List[str] = []
+        self.exits_removed: List[str] = []
+        self.clock = None
+
+    @property
+    def is_empty(self):
+        return not self.to_dict()
+
+    def to_dict(self) -> dict:
+        """Return the fields of this delta that changed, as plain data.
+        """
+        return {
+            name: getattr(self, name) for name in self.__slots__ if getattr(self, name) not in (None, [])
+        }
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({self.to_dict()})'
+
+
+def _changes(names: List[str], previous: FrozenSet[str]):
+    current = frozenset(names)
+    return current, [name for name in names if name not in previous], sorted(previous - current)
+
+
+class StateTracker:
+    """The view of the game last sent to the client of a player, from which the delta of each turn is computed.
+
+    The place and the player are compared by version first, so a turn that changed neither costs no
+    comparison of items or exits.
+    """
+
+    def __init__(self, game, player: Player=None):
+        super().__init__()
+        self.game = game
+        self.player = player or game.player
+        self.place: Optional[Place] = None
+        self.place_version = None
+        self.player_version = None
+        self.items: FrozenSet[str] = frozenset()
+        self.exits: FrozenSet[str] = frozenset()
+        self.inventory: FrozenSet[str] = frozenset()
+        self.clock = None
+
+    def delta(self) -> StateDelta:
+        """Return what changed since the last delta, the first one holding the whole view.
+        """
+        delta = StateDelta()
+        location = self.player.location
+        if location is not self.place:
+            delta.place = location.name
+            self.place, self.place_version = location, None
+            self.items, self.exits = frozenset(), frozenset()
+        if location.version != self.place_version:
+            self.items, delta.items_added, delta.items_removed = _changes(
+                [item.name for item in location.inventory], self.items
+            )
+            self.exits, delta.exits_added, delta.exits_removed = _changes(
+                [direction.name for direction in location.obvious_exits], self.exits
+            )
+            self.place_version = location.version
+        if self.player.version != self.player_version:
+            self.inventory, delta.inventory_added, delta.inventory_removed = _changes(
+                [item.name for item in self.player.inventory], self.inventory
+            )
+            self.player_version = self.player.version
+        clock = self.game.clock
+        if clock != self.clock:
+            delta.clock = self.clock = clock
+        return delta
+
+    def describe(self) -> str:
+        """Return the full text description of where the player is, for clients that ask for it.
+        """
+        return self.player.location.description
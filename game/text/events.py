@@ -0,0 +1,48 @@
+import threading
+from typing import Dict, Hashable, List, Set
+
+from game.text.things import Place
+
+
+class EventBus:
+    """Delivers messages about what happens in a place only to the players and spectators in that place.
+
+    Messages are queued per subscriber and handed out in one batch per subscriber on each flush,
+    so the cost of an event is proportional to the number of subscribers in its place.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.subscribers_by_place: Dict[Place, Set[Hashable]] = {}
+        self.pending: Dict[Hashable, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, place: Place, subscriber: Hashable):
+        with self._lock:
+            self.subscribers_by_place.setdefault(place, set()).add(subscriber)
+
+    def unsubscribe(self, place: Place, subscriber: Hashable):
+        with self._lock:
+            self.subscribers_by_place.get(place, set()).discard(subscriber)
+
+    def move(self, subscriber: Hashable, from_place: Place, to_place: Place):
+        """Move the subscription of a subscriber from one place to another.
+        """
+        with self._lock:
+            self.subscribers_by_place.get(from_place, set()).discard(subscriber)
+            self.subscribers_by_place.setdefault(to_place, set()).add(subscriber)
+
+    def publish(self, place: Place, message: str, source: Hashable=None):
+        """Queue a message for every subscriber in the given place, except the source of the event.
+        """
+        with self._lock:
+            for subscriber in self.subscribers_by_place.get(place, ()):
+                if subscriber is not source:
+                    self.pending.setdefault(subscriber, []).append(message)
+
+    def flush(self) -> Dict[Hashable, str]:
+        """Return the messages queued since the last flush, combined into one text per subscriber.
+        """
+        with self._lock:
+            pending, self.pending = self.pending, {}
+        return {subscriber: '\n'.join(messages) for subscriber, messages in pending.items()}
@@ -0,0 +1,119 @@
+import json
+import os
+import random
+import string
+import traceback
+import zlib
+from typing import List, Optional
+
+
+class FuzzCrash:
+    """A command sequence that makes the game raise, with what it raised.
+    """
+    def __init__(self, seed: int, commands: List[str], error: BaseException):
+        super().__init__()
+        self.seed = seed
+        self.commands = commands
+        self.error_type = type(error).__name__
+        self.error_message = str(error)
+        self.traceback = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+
+    @property
+    def signature(self):
+        return self.error_type, self.error_message
+
+    def to_json(self) -> dict:
+        return {
+            'seed': self.seed,
+            'commands': self.commands,
+            'error_type': self.error_type,
+            'error_message': self.error_message,
+            'traceback': self.traceback,
+        }
+
+    def __str__(self):
+        return f'{self.error_type}({self.error_message}) after {self.commands}'
+
+
+class Fuzzer:
+    """Drives random command sequences through a game to find commands that raise instead of failing cleanly.
+
+    Sequences mix commands from the grammar vocabulary with invalid words. Every crashing sequence is
+    shrunk to a minimal one that still raises the same error, and the same seed reproduces the same run.
+    """
+
+    def __init__(self, game, seed: int=0, sequence_length: int=20, invalid_ratio: float=0.2):
+        super().__init__()
+        self.game = game
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.sequence_length = sequence_length
+        self.invalid_ratio = invalid_ratio
+        self.vocabulary = [command for command, action in game.grammar.vocabulary()]
+        self.verbs = sorted({command.split()[0] for command in self.vocabulary})
+        self.initial_state = game.export_state()
+        self.turns = 0
+
+    def random_command(self) -> str:
+        if self.random.random() >= self.invalid_ratio:
+            return self.random.choice(self.vocabulary)
+        word = ''.join(self.random.choice(string.ascii_lowercase) for _ in range(self.random.randint(0, 6)))
+        return self.random.choice([word, f'{self.random.choice(self.verbs)} {word}', f'{word} {word}'])
+
+    def random_sequence(self) -> List[str]:
+        return [self.random_command() for _ in range(self.sequence_length)]
+
+    def run(self, commands: List[str]) -> Optional[BaseException]:
+        """Play the given commands from the initial state and return the error raised, if any.
+        """
+        self.game.import_state(self.initial_state)
+        for number, text_input in enumerate(commands):
+            self.turns += 1
+            try:
+                self.game.try_take_turn(text_input)
+            except Exception as error:
+                error.commands_played = number + 1
+                return error
+        return None
+
+    def minimize(self, commands: List[str], error: BaseException) -> List[str]:
+        """Return a shortest found subsequence of the given commands that still raises the same error.
+        """
+        signature = type(error), str(error)
+        commands = commands[:error.commands_played]
+        position = 0
+        while position < len(commands):
+            candidate = commands[:position] + commands[position + 1:]
+            candidate_error = self.run(candidate)
+            if candidate_error is not None and (type(candidate_error), str(candidate_error)) == signature:
+                commands = candidate[:candidate_error.commands_played]
+            else:
+                position += 1
+        return commands
+
+    def fuzz(self, sequences: int) -> List[FuzzCrash]:
+        """Run the given number of random sequences and return one minimized crash per distinct error.
+        """
+        crashes = {}
+        for _ in range(sequences):
+            commands = self.random_sequence()
+            error = self.run(commands)
+            if error is None:
+                continue
+            commands = self.minimize(commands, error)
+            crash = FuzzCrash(self.seed, commands, self.run(commands))
+            if crash.signature not in crashes or len(commands) < len(crashes[crash.signature].commands):
+                crashes[crash.signature] = crash
+        self.game.import_state(self.initial_state)
+        return list(crashes.values())
+
+    @staticmethod
+    def write_report(crash: FuzzCrash, directory) -> str:
+        """Write a reproducible crash report as JSON into the given directory and return its path.
+        """
+        os.makedirs(directory, exist_ok=True)
+        checksum = zlib.crc32(repr(crash.signature).encode('utf-8'))
+        path = os.path.join(directory, f'crash-{crash.error_type}-{checksum:08x}.json')
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(crash.to_json(), report_file, indent=2)
+        return path
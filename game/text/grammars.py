@@ -1,7 +1,9 @@
 import re
-from typing import Tuple
+from typing import List, Tuple
 
-from game.text.things import Thing, Action, IndexOfThings, ThingError
+from game.text import tracing
+from game.text.results import Outcome, OutcomeStatus
+from game.text.things import Thing, Action, ActionableThing, IndexOfThings, ThingError
 
 
 class SimplePhrase:
@@ -30,6 +32,36 @@ class SimplePhrase:
         return f'{self.__class__}: {self.verb}, {self.object}'
 
 
+class ScannedPhrase:
+    """Verb and object of a command, found in one whitespace scan of the input without regular expressions.
+
+    The verb is the first word and the object the last word that is not a noise word; only those two
+    words are lowercased. A phrase like "get all from library" is bulk: its verb applies to everything
+    in the object rather than to the object itself.
+    """
+    __slots__ = ('verb', 'object', 'is_bulk')
+
+    noise_words = frozenset(('the', 'a', 'an', 'at'))
+    bulk_words = frozenset(('all', 'everything'))
+
+    def __init__(self, text_input):
+        self.verb = ''
+        self.object = None
+        self.is_bulk = False
+        words = text_input.split()
+        if words:
+            self.verb = words[0].lower()
+            for position in range(len(words) - 1, 0, -1):
+                word = words[position].lower()
+                if word not in self.noise_words:
+                    self.object = word
+                    self.is_bulk = position > 1 and words[1].lower() in self.bulk_words
+                    break
+
+    def __str__(self):
+        return f'{self.__class__}: {self.verb}, {self.object}'
+
+
 class GrammarError(Exception):
     pass
 
@@ -51,6 +83,7 @@ class GrammarUnknownActionForThingError(GrammarError, ThingError):
 
 
 class SimpleGrammar:
+    command_separator = ';'
 
 
 #TODO: things must include all places, items, directions - all things that have associated actions
@@ -63,6 +96,11 @@ class SimpleGrammar:
 #TODO: need to account for aliases of things and index by those too...
         self.raw_actions_by_verb = IndexOfThings(raw_actions)
 
+    def add_thing(self, thing: Thing):
+        """Let commands refer to a thing created while the game runs.
+        """
+        self.things_by_name.add_thing(thing)
+
     @property
     def is_parsed(self):
         return self.verb is not None
@@ -70,23 +108,68 @@ class SimpleGrammar:
     def parse(self, text_input: str) -> Tuple[Action, Thing or None]:
         """ Parse the given text input and return a tuple of action and thing.
         """
-        text_input = text_input.lower().strip()
-        phrase = SimplePhrase(text_input)
-        if phrase.verb is None:
+        outcome = self.try_parse(text_input)
+        if outcome.status == OutcomeStatus.NO_INPUT:
             raise GrammarVerbIsMissingError()
-        if phrase.object is None:
-            try:
-                action = self.raw_actions_by_verb.lookup(phrase.verb)
-            except KeyError:
-                raise GrammarUnknownActionError()
-            return action, None
-        else:
-            try:
-                thing = self.things_by_name.lookup(phrase.object)
-            except KeyError:
-                raise GrammarUnknownThingError()
-            try:
-                action = thing.get_action(phrase.verb)
-            except KeyError:
-                raise GrammarUnknownActionForThingError(thing)
-            return action, thing
+        if outcome.status == OutcomeStatus.UNKNOWN_ACTION:
+            raise GrammarUnknownActionError()
+        if outcome.status == OutcomeStatus.UNKNOWN_THING:
+            raise GrammarUnknownThingError()
+        if outcome.status == OutcomeStatus.UNKNOWN_ACTION_FOR_THING:
+            raise GrammarUnknownActionForThingError(outcome.thing)
+        return outcome.action, outcome.thing
+
+    def split_line(self, text_input: str, macros=None, expanding=frozenset()) -> List[str]:
+        """ Split the given input line into its commands, replacing macro names by the commands they stand for.
+        """
+        macros = macros or {}
+        commands = []
+        for command in text_input.split(self.command_separator):
+            command = command.strip()
+            name = command.lower()
+            if name in macros and name not in expanding:
+                commands.extend(self.split_line(macros[name], macros, expanding | {name}))
+            elif command != '':
+                commands.append(command)
+        return commands or [text_input]
+
+    def try_parse_line(self, text_input: str, macros=None) -> List[Outcome]:
+        """ Parse every command of the given input line, returning an outcome for each.
+        """
+        outcomes = []
+        for command in self.split_line(text_input, macros):
+            outcome = self.try_parse(command)
+            outcome.command = command
+            outcomes.append(outcome)
+        return outcomes
+
+    def vocabulary(self) -> List[Tuple[str, Action]]:
+        """ Return every command this grammar can parse into an action, with that action.
+        """
+        commands = [(action.name, action) for action in self.raw_actions_by_verb.values()]
+        for thing in self.things_by_name.values():
+            if isinstance(thing, ActionableThing):
+                word = thing.name.split()[0].lower()
+                commands.extend((f'{action.name} {word}', action) for action in thing.actions.values())
+        return commands
+
+    def try_parse(self, text_input: str) -> Outcome:
+        """ Parse the given text input and return an outcome with the action and thing, without raising on failure.
+        """
+        with tracing.span('tokenize'):
+            phrase = ScannedPhrase(text_input)
+        if not phrase.verb:
+            return Outcome(OutcomeStatus.NO_INPUT)
+        with tracing.span('lookup'):
+            if phrase.object is None:
+                action = self.raw_actions_by_verb.find(phrase.verb)
+                if action is None:
+                    return Outcome(OutcomeStatus.UNKNOWN_ACTION)
+                return Outcome(OutcomeStatus.OK, action=action)
+            thing = self.things_by_name.find(phrase.object)
+            if thing is None:
+                return Outcome(OutcomeStatus.UNKNOWN_THING)
+            action = thing.find_action(f'{phrase.verb} all' if phrase.is_bulk else phrase.verb)
+            if action is None:
+                return Outcome(OutcomeStatus.UNKNOWN_ACTION_FOR_THING, thing=thing)
+            return Outcome(OutcomeStatus.OK, action=action, thing=thing)
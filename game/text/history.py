@@ -0,0 +1,98 @@
+import weakref
+from typing import Dict, List, Optional
+
+from game.text.transactions import record_state
+
+
+class CommandHistory:
+    """Log of executed commands with periodic state checkpoints, used to undo and redo turns.
+
+    Any state in the log is reconstructed by restoring the nearest earlier checkpoint and replaying
+    the commands that follow it, so the cost of undo is bounded by the checkpoint interval.
+
+    Only the last max_commands commands can be undone: once the log is longer, the commands before the
+    latest checkpoint that keeps that many are dropped along with their checkpoints, so the log holds at
+    most max_commands plus one checkpoint interval.
+    """
+
+    def __init__(self, game, checkpoint_interval: int=10, max_commands: int=1000):
+        super().__init__()
+        self._game = weakref.ref(game)
+        self.checkpoint_interval = checkpoint_interval
+        self.max_commands = max_commands
+        self.commands: List[str] = []
+        self.position = 0
+        self.checkpoints: Dict[int, dict] = {0: game.snapshot()}
+
+    @property
+    def game(self):
+        return self._game()
+
+    @property
+    def can_undo(self):
+        return self.position > 0
+
+    @property
+    def can_redo(self):
+        return self.position < len(self.commands)
+
+    @property
+    def last_command(self) -> Optional[str]:
+        if self.can_undo:
+            return self.commands[self.position - 1]
+        return None
+
+    def transaction_state(self) -> int:
+        return self.position
+
+    def restore_transaction_state(self, position: int):
+        self.position = position
+
+    def record(self, text_input: str):
+        """Record a command that has just been executed, discarding any commands that could be redone.
+        """
+        if self.can_redo:
+            del self.commands[self.position:]
+            for position in [position for position in self.checkpoints if position > self.position]:
+                del self.checkpoints[position]
+        self.commands.append(text_input)
+        self.position += 1
+        if self.position % self.checkpoint_interval == 0:
+            self.checkpoints[self.position] = self.game.snapshot()
+        if len(self.commands) > self.max_commands:
+            self.drop_oldest()
+
+    def drop_oldest(self):
+        """Drop the oldest commands and checkpoints, keeping max_commands commands from the nearest checkpoint.
+        """
+        excess = len(self.commands) - self.max_commands
+        oldest = max(checkpoint for checkpoint in self.checkpoints if checkpoint <= excess)
+        if oldest == 0:
+            return
+        del self.commands[:oldest]
+        self.checkpoints = {
+            checkpoint - oldest: snapshot for checkpoint, snapshot in self.checkpoints.items() if checkpoint >= oldest
+        }
+        self.position -= oldest
+
+    def undo(self):
+        """Return the game to the state before the last executed command.
+        """
+        self.rewind_to(self.position - 1)
+
+    def redo(self):
+        """Execute again the last undone command.
+        """
+        record_state(self)
+        self.game.run_command(self.commands[self.position])
+        self.position += 1
+
+    def rewind_to(self, position: int):
+        """Reconstruct the game state after the given number of logged commands.
+        """
+        record_state(self)
+        checkpoint = max(checkpoint for checkpoint in self.checkpoints if checkpoint <= position)
+        self.game.restore(self.checkpoints[checkpoint])
+        for text_input in self.commands[checkpoint:position]:
+            self.game.run_command(text_input)
+        self.position = position
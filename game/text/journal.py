@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Tuple
+
+
+class Journal:
+    """Append-only log of the commands accepted by many game sessions, used to recover them after a crash.
+
+    Records are buffered and made durable in groups: one flush and fsync commits every record appended
+    since the last commit, whichever sessions they belong to. With a max delay, a batch that does not fill
+    up is committed that many seconds after its first record, so a quiet journal loses no more than that.
+    """
+
+    def __init__(self, path, batch_size: int=64, max_delay: float=None):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.pending = 0
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._deadline = None
+
+    def append(self, session_id: str, text_input: str):
+        """Append a command accepted by the given session, committing when a full batch is pending.
+        """
+        self._write({'session': session_id, 'command': text_input})
+
+    def append_snapshot(self, session_id: str, state: dict):
+        """Append a snapshot of the state of the given session, superseding its earlier records.
+        """
+        self._write({'session': session_id, 'snapshot': state})
+
+    def _write(self, record: dict):
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self.file.write(line)
+            self.pending += 1
+            if self.pending >= self.batch_size:
+                self._commit()
+            elif self.pending == 1 and self.max_delay is not None:
+                self._deadline = threading.Timer(self.max_delay, self.commit)
+                self._deadline.daemon = True
+                self._deadline.start()
+
+    def commit(self):
+        """Make all pending records durable with a single flush and fsync.
+        """
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+        if self.pending > 0:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self.file.close()
+
+    def read(self) -> Dict[str, Tuple[dict or None, List[str]]]:
+        """Return the latest snapshot and the commands accepted after it for each session in the journal.
+        """
+        with self._lock:
+            self.file.flush()
+        sessions = {}
+        with open(self.path, encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break   # torn write at the end of the journal
+                if 'snapshot' in record:
+                    sessions[record['session']] = (record['snapshot'], [])
+                else:
+                    sessions.setdefault(record['session'], (None, []))[1].append(record['command'])
+        return sessions
+
+    def recover(self, game_factory: Callable[[], 'TextGameSinglePlayer']) -> Dict[str, 'TextGameSinglePlayer']:
+        """Rebuild every session in the journal by replaying its commands, and attach this journal to it.
+        """
+        games = {}
+        for session_id, (state, commands) in self.read().items():
+            game = game_factory()
+            if state is not None:
+                game.import_state(state)
+            for text_input in commands:
+                game.try_take_turn(text_input)
+            game.attach_journal(self, session_id)
+            games[session_id] = game
+        return games
+
+    def compact(self, games: Dict[str, 'TextGameSinglePlayer']):
+        """Replace the journal with a single snapshot record for each of the given sessions.
+        """
+        compacted_path = f'{self.path}.compact'
+        with self._lock:
+            self._commit()
+            self.file.close()
+            with open(compacted_path, 'w', encoding='utf-8') as compacted_file:
+                for session_id, game in games.items():
+                    compacted_file.write(json.dumps({'session': session_id, 'snapshot': game.export_state()}) + '\n')
+                compacted_file.flush()
+                os.fsync(compacted_file.fileno())
+            os.replace(compacted_path, self.path)
+            self.file = open(self.path, 'a', encoding='utf-8')
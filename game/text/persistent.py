@@ -0,0 +1,298 @@
+from collections.abc import Mapping, MutableMapping
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+
+def _hash(key) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _position(bitmap: int, bit: int) -> int:
+    return bin(bitmap & (bit - 1)).count('1')
+
+
+class _CollisionNode:
+    """Entries whose keys have exactly the same hash.
+    """
+    __slots__ = ('key_hash', 'entries')
+
+    def __init__(self, key_hash, entries):
+        self.key_hash = key_hash
+        self.entries = entries
+
+    def get(self, key_hash, key, shift, default):
+        for entry_key, value in self.entries:
+            if entry_key == key:
+                return value
+        return default
+
+    def set(self, key_hash, key, value, shift):
+        if key_hash != self.key_hash:
+            node = _BitmapNode(1 << ((self.key_hash >> shift) & _MASK), (self,))
+            return node.set(key_hash, key, value, shift)
+        for position, (entry_key, entry_value) in enumerate(self.entries):
+            if entry_key == key:
+                if entry_value is value:
+                    return self, False
+                entries = self.entries[:position] + ((key, value),) + self.entries[position + 1:]
+                return _CollisionNode(key_hash, entries), False
+        return _CollisionNode(key_hash, self.entries + ((key, value),)), True
+
+    def delete(self, key_hash, key, shift):
+        for position, (entry_key, _) in enumerate(self.entries):
+            if entry_key == key:
+                entries = self.entries[:position] + self.entries[position + 1:]
+                if len(entries) == 1:
+                    return entries[0]
+                return _CollisionNode(key_hash, entries)
+        return self
+
+    def __iter__(self):
+        return iter(self.entries)
+
+
+class _BitmapNode:
+    """Up to 32 slots, one per value of the next few bits of the key hash, each a (key, value) entry or a node.
+    """
+    __slots__ = ('bitmap', 'slots')
+
+    def __init__(self, bitmap, slots):
+        self.bitmap = bitmap
+        self.slots = slots
+
+    def get(self, key_hash, key, shift, default):
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return default
+        slot = self.slots[_position(self.bitmap, bit)]
+        if type(slot) is tuple:
+            return slot[1] if slot[0] == key else default
+        return slot.get(key_hash, key, shift + _BITS, default)
+
+    def set(self, key_hash, key, value, shift):
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        position = _position(self.bitmap, bit)
+        if not self.bitmap & bit:
+            slots = self.slots[:position] + ((key, value),) + self.slots[position:]
+            return _BitmapNode(self.bitmap | bit, slots), True
+        slot = self.slots[position]
+        if type(slot) is tuple:
+            if slot[0] == key:
+                if slot[1] is value:
+                    return self, False
+                replacement, added = (key, value), False
+            else:
+                replacement, added = _merge(slot, _hash(slot[0]), (key, value), key_hash, shift + _BITS), True
+        else:
+            replacement, added = slot.set(key_hash, key, value, shift + _BITS)
+            if replacement is slot:
+                return self, False
+        return _BitmapNode(self.bitmap, self.slots[:position] + (replacement,) + self.slots[position + 1:]), added
+
+    def delete(self, key_hash, key, shift):
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self
+        position = _position(self.bitmap, bit)
+        slot = self.slots[position]
+        if type(slot) is tuple:
+            if slot[0] != key:
+                return self
+            replacement = None
+        else:
+            replacement = slot.delete(key_hash, key, shift + _BITS)
+            if replacement is slot:
+                return self
+        if replacement is None:
+            slots = self.slots[:position] + self.slots[position + 1:]
+            if not slots:
+                return None
+            if len(slots) == 1 and type(slots[0]) is tuple and shift > 0:
+                return slots[0]
+            return _BitmapNode(self.bitmap ^ bit, slots)
+        if type(replacement) is tuple and len(self.slots) == 1 and shift > 0:
+            return replacement
+        return _BitmapNode(self.bitmap, self.slots[:position] + (replacement,) + self.slots[position + 1:])
+
+    def __iter__(self):
+        for slot in self.slots:
+            if type(slot) is tuple:
+                yield slot
+            else:
+                yield from slot
+
+
+def _merge(first, first_hash, second, second_hash, shift):
+    if first_hash == second_hash:
+        return _CollisionNode(first_hash, (first, second))
+    first_bit = 1 << ((first_hash >> shift) & _MASK)
+    second_bit = 1 << ((second_hash >> shift) & _MASK)
+    if first_bit == second_bit:
+        return _BitmapNode(first_bit, (_merge(first, first_hash, second, second_hash, shift + _BITS),))
+    slots = (first, second) if first_bit < second_bit else (second, first)
+    return _BitmapNode(first_bit | second_bit, slots)
+
+
+_EMPTY_ROOT = _BitmapNode(0, ())
+_MISSING = object()
+
+
+class PersistentMap(Mapping):
+    """Immutable hash array mapped trie: every change returns a new map sharing all unchanged nodes.
+
+    Copying a map is free, and setting or deleting a key costs O(log n) new nodes.
+    """
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, items=None):
+        self._root = _EMPTY_ROOT
+        self._size = 0
+        if items is not None:
+            for key, value in dict(items).items():
+                self._root, added = self._root.set(_hash(key), key, value, 0)
+                self._size += added
+
+    @classmethod
+    def _from_root(cls, root, size):
+        persistent_map = cls.__new__(cls)
+        persistent_map._root = root if root is not None else _EMPTY_ROOT
+        persistent_map._size = size
+        return persistent_map
+
+    def set(self, key, value) -> 'PersistentMap':
+        root, added = self._root.set(_hash(key), key, value, 0)
+        if root is self._root:
+            return self
+        return self._from_root(root, self._size + added)
+
+    def delete(self, key) -> 'PersistentMap':
+        root = self._root.delete(_hash(key), key, 0)
+        if root is self._root:
+            raise KeyError(key)
+        return self._from_root(root, self._size - 1)
+
+    def get(self, key, default=None):
+        return self._root.get(_hash(key), key, 0, default)
+
+    def __getitem__(self, key):
+        value = self._root.get(_hash(key), key, 0, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._root.get(_hash(key), key, 0, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        for key, _ in self._root:
+            yield key
+
+    def items(self):
+        return list(self._root)
+
+    def __len__(self):
+        return self._size
+
+
+class PersistentDict(MutableMapping):
+    """Mutable view of successive versions of a persistent map, so any version can be kept in O(1).
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.map = PersistentMap(dict(*args, **kwargs))
+
+    def snapshot(self) -> PersistentMap:
+        return self.map
+
+    def restore(self, persistent_map: PersistentMap):
+        self.map = persistent_map
+
+    def get(self, key, default=None):
+        return self.map.get(key, default)
+
+    def __getitem__(self, key):
+        return self.map[key]
+
+    def __setitem__(self, key, value):
+        self.map = self.map.set(key, value)
+
+    def __delitem__(self, key):
+        self.map = self.map.delete(key)
+
+    def __contains__(self, key):
+        return key in self.map
+
+    def __iter__(self):
+        return iter(self.map)
+
+    def __len__(self):
+        return len(self.map)
+
+    def update(self, *args, **kwargs):
+        persistent_map = self.map
+        for key, value in dict(*args, **kwargs).items():
+            persistent_map = persistent_map.set(key, value)
+        self.map = persistent_map
+
+
+class PersistentSequence:
+    """Immutable sequence of values at increasing positions, with gaps where values were deleted.
+
+    Positions are stored in a hash array mapped trie under their base-32 digits in reverse order, so the
+    trie branches on the most significant digit first and iterating over it yields the values in position
+    order, without sorting. Appending or deleting a value costs one new node per digit of the capacity.
+    """
+    __slots__ = ('_root', '_size', '_digits', 'end', 'capacity')
+
+    def __init__(self, values=None, capacity: int=1 << _BITS):
+        values = list(values) if values is not None else []
+        self._digits = 1
+        while 1 << (self._digits * _BITS) < max(capacity, len(values)):
+            self._digits += 1
+        self.capacity = 1 << (self._digits * _BITS)
+        self._root = _EMPTY_ROOT
+        for position, value in enumerate(values):
+            code = self._code(position)
+            self._root, _ = self._root.set(code, code, value, 0)
+        self._size = self.end = len(values)
+
+    def _code(self, position: int) -> int:
+        code = 0
+        for _ in range(self._digits):
+            code = (code << _BITS) | (position & _MASK)
+            position >>= _BITS
+        return code
+
+    def _derive(self, root, size, end) -> 'PersistentSequence':
+        sequence = self.__class__.__new__(self.__class__)
+        sequence._root = root if root is not None else _EMPTY_ROOT
+        sequence._size = size
+        sequence._digits = self._digits
+        sequence.end = end
+        sequence.capacity = self.capacity
+        return sequence
+
+    def append(self, value) -> 'PersistentSequence':
+        """Return a new sequence with the given value at position end.
+        """
+        if self.end >= self.capacity:
+            raise IndexError(f'The sequence is full at {self.capacity} positions')
+        code = self._code(self.end)
+        root, _ = self._root.set(code, code, value, 0)
+        return self._derive(root, self._size + 1, self.end + 1)
+
+    def delete(self, position: int) -> 'PersistentSequence':
+        code = self._code(position)
+        root = self._root.delete(code, code, 0)
+        if root is self._root:
+            raise KeyError(position)
+        return self._derive(root, self._size - 1, self.end)
+
+    def __iter__(self):
+        for _, value in self._root:
+            yield value
+
+    def __len__(self):
+        return self._size
@@ -1,3 +1,6 @@
+from enum import IntEnum
+
+
 class Result:
     def __init__(self, message):
         self.message = message
@@ -12,3 +15,77 @@ class ResultSuccess(Result):
 
 class ResultFailure(Result):
     pass
+
+
+class OutcomeStatus(IntEnum):
+    OK = 0
+    NO_INPUT = 1
+    UNKNOWN_THING = 2
+    UNKNOWN_ACTION = 3
+    UNKNOWN_ACTION_FOR_THING = 4
+    ACTION_FAILED = 5
+
+
+class Refusal:
+    """Why a command failed: the type of the error, and what it is about if anything, such as a thing.
+
+    Failing commands are common, so the error itself is only created when its text is rendered or when it
+    is raised by one of the raising wrappers.
+    """
+    __slots__ = ('error_type', 'thing')
+
+    def __init__(self, error_type, thing=None):
+        self.error_type = error_type
+        self.thing = thing
+
+    @property
+    def error(self):
+        if self.thing is None:
+            return self.error_type()
+        return self.error_type(self.thing)
+
+    @property
+    def message(self):
+        return str(self.error)
+
+
+class Outcome:
+    """Structured outcome of parsing or executing a command, returned instead of raising an error.
+    """
+    def __init__(self, status: OutcomeStatus, action=None, thing=None, result=None, error=None, outcomes=None,
+                 refusal: Refusal=None):
+        self.status = status
+        self.action = action
+        self.thing = thing
+        self.result = result
+        self._error = error
+        self.refusal = refusal
+        self.outcomes = outcomes
+        self.command = None
+
+    @property
+    def error(self):
+        if self._error is None and self.refusal is not None:
+            self._error = self.refusal.error
+        return self._error
+
+    @error.setter
+    def error(self, error):
+        self._error = error
+
+    @property
+    def is_success(self):
+        return self.status == OutcomeStatus.OK
+
+    @property
+    def message(self):
+        if self.outcomes is not None:
+            return '\n'.join(outcome.message for outcome in self.outcomes)
+        if self.error is not None:
+            return str(self.error)
+        if self.result is not None:
+            return str(self.result)
+        return ''
+
+    def __str__(self):
+        return self.message
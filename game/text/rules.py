@@ -0,0 +1,100 @@
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game.text.things import Item, Place, Player
+
+
+Event = namedtuple('Event', ['kind', 'item', 'place', 'player'])
+
+
+class Rule:
+    """Game logic that fires on events of one kind, optionally only for one item and/or one place.
+
+    Event kinds are action names, as in 'get' or 'hit', and 'arrive' for a player entering a place.
+
+    When a matching event happens and the condition (if any) holds, the effect is applied; the text it
+    returns, if any, is added to the result of the command that caused the event.
+    """
+
+    def __init__(self, kind: str, effect: Callable[[Event], Optional[str]], item: Item=None, place: Place=None,
+                 condition: Callable[[Event], bool]=None, name: str=None):
+        super().__init__()
+        self.kind = kind
+        self.effect = effect
+        self.item = item
+        self.place = place
+        self.condition = condition
+        self.name = name or getattr(effect, '__name__', kind)
+        self.number = None
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({self.name})'
+
+
+class RuleEngine:
+    """Rules indexed by event kind, then by item and place, so an event only visits the rules that can match it.
+
+    An event of a kind no rule has costs one dictionary lookup. Otherwise it is looked up under its exact
+    item and place, its item in any place, any item in its place, and any item anywhere: four more lookups,
+    whatever the number of rules. Matching rules fire in the order they were added.
+    """
+
+    def __init__(self, rules: List[Rule]=None):
+        super().__init__()
+        self.rules_by_kind: Dict[str, Dict[Tuple[Optional[Item], Optional[Place]], List[Rule]]] = {}
+        self.added_count = 0
+        for rule in rules or []:
+            self.add(rule)
+
+    def __len__(self):
+        return sum(len(rules) for rules_by_key in self.rules_by_kind.values() for rules in rules_by_key.values())
+
+    def add(self, rule: Rule) -> Rule:
+        rule.number = self.added_count
+        self.added_count += 1
+        self.rules_by_kind.setdefault(rule.kind, {}).setdefault((rule.item, rule.place), []).append(rule)
+        return rule
+
+    def remove(self, rule: Rule):
+        rules_by_key = self.rules_by_kind[rule.kind]
+        rules = rules_by_key[rule.item, rule.place]
+        rules.remove(rule)
+        if not rules:
+            del rules_by_key[rule.item, rule.place]
+            if not rules_by_key:
+                del self.rules_by_kind[rule.kind]
+
+    def rules_for(self, event: Event) -> List[Rule]:
+        """Return the rules indexed under the given event, in the order they were added.
+        """
+        rules_by_key = self.rules_by_kind.get(event.kind)
+        if rules_by_key is None:
+            return []
+        rules = []
+        for key in {(event.item, event.place), (event.item, None), (None, event.place), (None, None)}:
+            rules.extend(rules_by_key.get(key, ()))
+        if len(rules) > 1:
+            rules.sort(key=lambda rule: rule.number)
+        return rules
+
+    def fire(self, event: Event) -> List[str]:
+        """Apply the effect of every rule matching the given event, returning the texts they produced.
+        """
+        messages = []
+        for rule in self.rules_for(event):
+            if rule.condition is None or rule.condition(event):
+                message = rule.effect(event)
+                if message is not None:
+                    messages.append(message)
+        return messages
+
+    def fire_for_action(self, action, thing, player: Player, location: Place) -> List[str]:
+        """Fire the events of an action the player executed on the given thing from the given location.
+        """
+        rules_by_kind = self.rules_by_kind
+        messages = []
+        if action.name in rules_by_kind:
+            messages.extend(self.fire(Event(action.name, thing, location, player)))
+        if player.location is not location and 'arrive' in rules_by_kind:
+            messages.extend(self.fire(Event('arrive', None, player.location, player)))
+        return messages
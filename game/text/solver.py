@@ -0,0 +1,104 @@
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class SolverLimitReachedError(Exception):
+    pass
+
+
+class Solver:
+    """Breadth first search of the reachable states of a game, using its own actions as transitions.
+
+    Each state is stored as a compact tuple of integers (player location, the container of every item,
+    the other snapshot values and the end flags) in a transposition table, so no state is expanded twice.
+    The first goal state found is reached by the shortest command sequence; if the search runs out of
+    states without finding one, no command sequence can reach the goal.
+    """
+
+    # snapshot values held by the state key on their own, or that do not tell states apart
+    NOT_EXTRA_NAMES = ('location', 'items', 'turns', 'is_ended', 'is_won')
+
+    def __init__(self, game, is_goal: Callable[['TextGameSinglePlayer'], bool]=None, max_states: int=None):
+        super().__init__()
+        self.game = game
+        self.is_goal = is_goal or (lambda solved_game: solved_game.is_won)
+        self.max_states = max_states
+        self.containers = list(game.item_containers)
+        self.container_numbers = {container: number for number, container in enumerate(self.containers)}
+        self.items = [item for container in self.containers for item in container.inventory]
+        self.item_numbers = {item: number for number, item in enumerate(self.items)}
+        self.extra_names = sorted(name for name in game.snapshot() if name not in self.NOT_EXTRA_NAMES)
+        self.commands = self.get_commands()
+        self.parents: Dict[tuple, Optional[Tuple[tuple, str]]] = {}
+
+    def get_commands(self) -> List[str]:
+        """Return every command that can be formed from the vocabulary of the game grammar.
+        """
+        return [command for command, action in self.game.grammar.vocabulary() if action.is_recorded]
+
+    @property
+    def states_explored(self):
+        return len(self.parents)
+
+    def state_key(self) -> tuple:
+        snapshot = self.game.snapshot()
+        placement = [-1] * len(self.items)
+        for container, items in snapshot['items'].items():
+            for item in items:
+                if item not in self.item_numbers:
+                    self.item_numbers[item] = len(self.items)
+                    self.items.append(item)
+                    placement.append(-1)
+                placement[self.item_numbers[item]] = self.container_numbers[container]
+        return (
+            self.container_numbers[snapshot['location']],
+            tuple(placement),
+            tuple(snapshot[name] for name in self.extra_names),
+            self.game.is_ended,
+            self.game.is_won,
+        )
+
+    def load(self, key: tuple):
+        location, placement, extras, self.game.is_ended, self.game.is_won = key
+        items_by_container = {container: [] for container in self.containers}
+        for item, container in zip(self.items, placement):
+            if container >= 0:
+                items_by_container[self.containers[container]].append(item)
+        snapshot = {'location': self.containers[location], 'items': items_by_container}
+        snapshot.update(zip(self.extra_names, extras))
+        self.game.restore(snapshot)
+
+    def solve(self) -> Optional[List[str]]:
+        """Return the shortest command sequence reaching the goal, or None if the goal is unreachable.
+        """
+        start = self.state_key()
+        self.parents = {start: None}
+        frontier = deque([start])
+        try:
+            while frontier:
+                key = frontier.popleft()
+                self.load(key)
+                if self.is_goal(self.game):
+                    return self.path_to(key)
+                for command in self.commands:
+                    if not self.game.run_command(command).is_success:
+                        continue
+                    next_key = self.state_key()
+                    if next_key == key:
+                        continue
+                    if next_key not in self.parents:
+                        if self.max_states is not None and len(self.parents) >= self.max_states:
+                            raise SolverLimitReachedError(f'More than {self.max_states} states are reachable')
+                        self.parents[next_key] = (key, command)
+                        frontier.append(next_key)
+                    self.load(key)
+        finally:
+            self.load(start)
+        return None
+
+    def path_to(self, key: tuple) -> List[str]:
+        commands = []
+        while self.parents[key] is not None:
+            key, command = self.parents[key]
+            commands.append(command)
+        return commands[::-1]
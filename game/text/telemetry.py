@@ -0,0 +1,170 @@
+import contextlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+from game.text.grammars import ScannedPhrase
+
+
+class TelemetryError(Exception):
+    pass
+
+
+class TelemetryLog:
+    """Columnar log of the commands players give, one array per field, flushed to a file in chunks.
+
+    Sessions, verbs and objects are stored as ids into dictionaries of names. Each chunk holds its
+    number of rows, the names added to the dictionaries since the previous chunk, and then every
+    column as raw little-endian values, so a reader can use the columns without parsing any text.
+
+    Opening an existing log continues it: the dictionaries and the turn counters of its sessions are
+    loaded from its chunks, and a chunk cut short at its end is cut off before new chunks are appended.
+    """
+
+    MAGIC = b'VTL1'
+    HEADER = struct.Struct('<4sII')           # magic, number of rows, length of the new names
+    COLUMNS = (
+        ('session', 'I'),
+        ('turn', 'I'),
+        ('verb', 'I'),
+        ('object', 'I'),
+        ('outcome', 'B'),
+        ('latency', 'I'),                     # microseconds
+    )
+    DICTIONARIES = ('session', 'verb', 'object')
+
+    def __init__(self, path, chunk_rows: int=65536):
+        super().__init__()
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.columns = {name: array(typecode) for name, typecode in self.COLUMNS}
+        self.ids: Dict[str, Dict[str, int]] = {name: {} for name in self.DICTIONARIES}
+        self.new_names: Dict[str, List[str]] = {name: [] for name in self.DICTIONARIES}
+        self.turns_by_session: Dict[int, int] = {}
+        self.file = open(self.path, 'ab')
+        if self.file.tell() > 0:
+            self._load()
+
+    def _load(self):
+        end = 0
+        for end, _, new_names, columns in _read_chunks(self.path):
+            for name, added in new_names.items():
+                ids = self.ids[name]
+                for added_name in added:
+                    ids[added_name] = len(ids)
+            sessions, turns = array('I'), array('I')
+            sessions.frombytes(columns['session'])
+            turns.frombytes(columns['turn'])
+            if sys.byteorder != 'little':
+                sessions.byteswap()
+                turns.byteswap()
+            self.turns_by_session.update(zip(sessions, turns))
+        if end < self.file.tell():
+            self.file.truncate(end)
+
+    def __len__(self):
+        return len(self.columns['turn'])
+
+    def get_id(self, dictionary: str, name: str) -> int:
+        ids = self.ids[dictionary]
+        name_id = ids.get(name)
+        if name_id is None:
+            name_id = ids[name] = len(ids)
+            self.new_names[dictionary].append(name)
+        return name_id
+
+    def record(self, session_id: str, command: str, status: int, latency: float):
+        """Append a row for a command given in the given session, with its outcome status and latency in seconds.
+        """
+        phrase = ScannedPhrase(command)
+        session = self.get_id('session', session_id or '')
+        turn = self.turns_by_session.get(session, 0) + 1
+        self.turns_by_session[session] = turn
+        columns = self.columns
+        columns['session'].append(session)
+        columns['turn'].append(turn)
+        columns['verb'].append(self.get_id('verb', phrase.verb))
+        columns['object'].append(self.get_id('object', phrase.object or ''))
+        columns['outcome'].append(int(status))
+        columns['latency'].append(min(int(latency * 1000000), 0xffffffff))
+        if len(columns['turn']) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Write the rows recorded since the last flush as one chunk.
+        """
+        rows = len(self)
+        if rows == 0:
+            return
+        names = json.dumps(self.new_names).encode('utf-8')
+        self.file.write(self.HEADER.pack(self.MAGIC, rows, len(names)))
+        self.file.write(names)
+        for name, typecode in self.COLUMNS:
+            column = self.columns[name]
+            if sys.byteorder != 'little':
+                column.byteswap()
+            column.tofile(self.file)
+            self.columns[name] = array(typecode)
+        self.file.flush()
+        self.new_names = {name: [] for name in self.DICTIONARIES}
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def read_chunks(path) -> Iterator[Tuple[int, Dict[str, List[str]], Dict[str, memoryview]]]:
+    """Yield the number of rows, the new dictionary names and the raw bytes of each column of every chunk.
+
+    The log is memory-mapped and columns are views into it, so reading costs no copy of the rows. A chunk
+    cut short by a crash while it was written ends the log.
+
+    The views of a chunk are released when the next chunk is read, and the map is closed when the log has
+    been read or the generator is closed. Buffers a reader still holds on the views keep the map open
+    until they are garbage collected.
+    """
+    for _, rows, new_names, columns in _read_chunks(path):
+        yield rows, new_names, columns
+
+
+def _release(views: Dict[str, memoryview]):
+    for view in views.values():
+        with contextlib.suppress(BufferError):
+            view.release()
+
+
+def _read_chunks(path) -> Iterator[Tuple[int, int, Dict[str, List[str]], Dict[str, memoryview]]]:
+    row_size = sum(array(typecode).itemsize for _, typecode in TelemetryLog.COLUMNS)
+    with open(path, 'rb') as log_file:
+        if os.fstat(log_file.fileno()).st_size == 0:
+            return
+        buffer = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+    data = memoryview(buffer)
+    columns: Dict[str, memoryview] = {}
+    try:
+        offset = 0
+        while offset + TelemetryLog.HEADER.size <= len(data):
+            _release(columns)
+            magic, rows, names_length = TelemetryLog.HEADER.unpack_from(data, offset)
+            if magic != TelemetryLog.MAGIC:
+                raise TelemetryError(f'{path} has no telemetry chunk at offset {offset}')
+            offset += TelemetryLog.HEADER.size
+            if offset + names_length + rows * row_size > len(data):
+                return
+            new_names = json.loads(bytes(data[offset:offset + names_length]))
+            offset += names_length
+            columns = {}
+            for name, typecode in TelemetryLog.COLUMNS:
+                size = rows * array(typecode).itemsize
+                columns[name] = data[offset:offset + size]
+                offset += size
+            yield offset, rows, new_names, columns
+    finally:
+        _release(columns)
+        data.release()
+        with contextlib.suppress(BufferError):
+            buffer.close()
@@ -0,0 +1,75 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy
+
+from game.text.results import OutcomeStatus
+from game.text.telemetry import TelemetryLog, read_chunks
+
+
+class TelemetryReader:
+    """Aggregates columnar telemetry logs with NumPy, one chunk at a time, without parsing any text.
+
+    Ids are counted per log with array operations and only turned into names once per log, so the cost
+    of an aggregate is a few passes over the columns, whatever the number of distinct names.
+    """
+
+    dtypes = {'I': numpy.dtype('<u4'), 'B': numpy.dtype('<u1')}
+
+    def __init__(self, paths: Iterable[str]):
+        super().__init__()
+        self.paths = list(paths)
+
+    def chunks(self, path) -> Iterator[Tuple[Dict[str, List[str]], Dict[str, numpy.ndarray]]]:
+        """Yield the dictionaries of the log so far and the columns of each chunk of the given log.
+        """
+        names = {name: [] for name in TelemetryLog.DICTIONARIES}
+        names['outcome'] = [status.name for status in OutcomeStatus]
+        for rows, new_names, raw_columns in read_chunks(path):
+            for name, added in new_names.items():
+                names[name].extend(added)
+            columns = {
+                name: numpy.frombuffer(raw_columns[name], dtype=self.dtypes[typecode], count=rows)
+                for name, typecode in TelemetryLog.COLUMNS
+            }
+            yield names, columns
+
+    def _aggregate(self, field: str, statuses=None, weights: str=None) -> Dict[str, Tuple[int, float]]:
+        totals: Dict[str, Tuple[int, float]] = {}
+        for path in self.paths:
+            counts, sums, names = numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0), []
+            for names, columns in self.chunks(path):
+                keys = columns[field]
+                weight_values = columns[weights] if weights is not None else None
+                if statuses is not None:
+                    mask = numpy.isin(columns['outcome'], [int(status) for status in statuses])
+                    keys = keys[mask]
+                    weight_values = weight_values[mask] if weight_values is not None else None
+                length = max(len(names[field]), len(counts))
+                counts = numpy.pad(counts, (0, length - len(counts)))
+                sums = numpy.pad(sums, (0, length - len(sums)))
+                counts += numpy.bincount(keys, minlength=length)
+                if weight_values is not None:
+                    sums += numpy.bincount(keys, weights=weight_values, minlength=length)
+            for key in numpy.flatnonzero(counts):
+                count, total = totals.get(names[field][key], (0, 0.0))
+                totals[names[field][key]] = (count + int(counts[key]), total + float(sums[key]))
+        return totals
+
+    def count_by(self, field: str, statuses: Iterable[OutcomeStatus]=None) -> Dict[str, int]:
+        """Return the number of rows for each session, verb, object or outcome, optionally only with given outcomes.
+        """
+        return {name: count for name, (count, _) in self._aggregate(field, statuses).items()}
+
+    def failure_rate_by(self, field: str) -> Dict[str, float]:
+        """Return the fraction of commands that did not succeed, for each session, verb or object.
+        """
+        failed = self.count_by(field, [status for status in OutcomeStatus if status != OutcomeStatus.OK])
+        return {name: failed.get(name, 0) / count for name, count in self.count_by(field).items()}
+
+    def mean_latency_by(self, field: str) -> Dict[str, float]:
+        """Return the mean latency in seconds of the commands for each session, verb, object or outcome.
+        """
+        return {
+            name: total / count / 1000000
+            for name, (count, total) in self._aggregate(field, weights='latency').items()
+        }
@@ -1,13 +1,18 @@
-from typing import List
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
 
-from game.text.grammars import (
-    GrammarUnknownActionForThingError,
-    GrammarVerbIsMissingError,
-    GrammarUnknownActionError,
-    GrammarUnknownThingError,
+from game.text import tracing
+from game.text.results import Outcome, OutcomeStatus, Refusal
+from game.text.events import EventBus
+from game.text.history import CommandHistory
+from game.text.rules import RuleEngine
+from game.text.transactions import Transaction, in_dry_run, record_state
+from game.text.things import (
+    Action, Actor, Result, Item, IndexOfThings, ItemContainerThing, Place, Player, GameError, Thing,
 )
-from game.text.things import Action, Actor, Player, GameError
-from game.text.actions import LookAction, InventoryAction, GoAction
+from game.text.actions import LookAction, InventoryAction, UndoAction, RedoAction
 from game.text.vampire.directions import all_directions
 
 
@@ -26,6 +31,24 @@ class GameUnknownActionError(GameError):
         return "I don't know how to do that."
 
 
+class GameInvalidMacroError(GameError):
+    def __str__(self):
+        return 'To define a macro, type: define name = command; command'
+
+
+class GamePlayerNotInGameError(GameError):
+    def __str__(self):
+        return 'You are not in the game.'
+
+
+game_errors_by_parse_status = {
+    OutcomeStatus.NO_INPUT: GameNoInputError,
+    OutcomeStatus.UNKNOWN_THING: GameUnknownObjectError,
+    OutcomeStatus.UNKNOWN_ACTION: GameUnknownActionError,
+    OutcomeStatus.UNKNOWN_ACTION_FOR_THING: GameUnknownActionError,
+}
+
+
 class TextGameSinglePlayer:
 
     def __init__(self, name, grammar):
@@ -36,14 +59,32 @@ class TextGameSinglePlayer:
         self.is_ended = False
         self.is_won = False
         self.turns = 0
+        self.events = None
+        self.rules = RuleEngine()
+        self.actions_by_thing: Dict[Thing, IndexOfThings] = {}
         self.player = Player(game=self, name='Player 1')
         self.player.location = self.starting_location
         self.continued_action = None
+        self.history = CommandHistory(game=self)
+        self.journal = None
+        self.telemetry = None
+        self.session_id = None
+        self.macros: Dict[str, str] = {}
+        # every item the game has had, by name, including items since removed from the world
+        self.items_by_name: Dict[str, Item] = {
+            item.name: item for container in self.item_containers for item in container.inventory
+        }
 
     @property
     def starting_location(self):
         return None
 
+    @property
+    def clock(self):
+        """Return the time of day in the game, or None if the game has no clock.
+        """
+        return None
+
     def set_default_actions(self):
         def execute_look(actor: Actor):
             self.increment_count()   # no limit on how many times this can be executed
@@ -69,16 +110,100 @@ class TextGameSinglePlayer:
         return not self.is_ended
 
     def take_turn(self, text_input):
-        try:
-            action, object = self.grammar.parse(text_input)
-            result = action.execute(self.player)
-        except GrammarVerbIsMissingError:
-            raise GameNoInputError()
-        except GrammarUnknownThingError:
-            raise GameUnknownObjectError()
-        except (GrammarUnknownActionError, GrammarUnknownActionForThingError):
-            raise GameUnknownActionError()
-        return result
+        outcome = self.try_take_turn(text_input)
+        if outcome.error is not None:
+            raise outcome.error
+        return outcome.result
+
+    def try_take_turn(self, text_input) -> Outcome:
+        """Parse and execute the given text input and return its outcome, without raising on failure.
+
+        An input line may hold several commands separated by ';', or macros standing for them. They are
+        executed in order within this turn, stopping at the first one that fails, with a combined outcome.
+        """
+        with tracing.span('turn', text=text_input):
+            if text_input.lower().startswith('define '):
+                return self.define_macro(text_input)
+            outcomes = []
+            for parsed in self.grammar.try_parse_line(text_input, self.macros):
+                if self.telemetry is None:
+                    outcome = self.execute_parsed(parsed)
+                else:
+                    started = time.perf_counter()
+                    outcome = self.execute_parsed(parsed)
+                    latency = time.perf_counter() - started
+                    self.telemetry.record(self.session_id, parsed.command, outcome.status, latency)
+                outcomes.append(outcome)
+                if not outcome.is_success:
+                    break
+                if outcome.action.is_recorded:
+                    self.history.record(parsed.command)
+                if self.journal is not None:
+                    self.journal.append(self.session_id, parsed.command)
+        return self.combine_outcomes(outcomes)
+
+    @staticmethod
+    def combine_outcomes(outcomes: List[Outcome]) -> Outcome:
+        """Return the outcome of a line of commands, from the outcomes of the commands executed.
+        """
+        if len(outcomes) == 1:
+            return outcomes[0]
+        outcome = outcomes[-1]
+        return Outcome(
+            outcome.status, action=outcome.action, thing=outcome.thing,
+            result=outcome.result, error=outcome.error if outcome.refusal is None else None,
+            outcomes=outcomes, refusal=outcome.refusal,
+        )
+
+    def define_macro(self, text_input) -> Outcome:
+        """Define a macro from input like "define name = command; command".
+        """
+        name, separator, commands = text_input[len('define '):].partition('=')
+        name, commands = name.strip().lower(), commands.strip()
+        if separator == '' or name == '' or ' ' in name or commands == '':
+            return Outcome(OutcomeStatus.UNKNOWN_ACTION, error=GameInvalidMacroError())
+        self.macros[name] = commands
+        if self.journal is not None:
+            self.journal.append(self.session_id, text_input)
+        return Outcome(OutcomeStatus.OK, result=Result(f'OK, "{name}" now means "{commands}"'))
+
+    def run_command(self, text_input) -> Outcome:
+        """Parse and execute the given text input without recording it in the command history.
+        """
+        return self.execute_parsed(self.grammar.try_parse(text_input))
+
+    def execute_parsed(self, outcome: Outcome) -> Outcome:
+        if outcome.is_success:
+            return self.execute_action(outcome.action, self.player, thing=outcome.thing)
+        outcome.refusal = Refusal(game_errors_by_parse_status[outcome.status])
+        return outcome
+
+    def dry_run(self, text_input) -> Outcome:
+        """Return the outcome the given text input would have, without changing the game or recording anything.
+        """
+        with Transaction(self.player, dry_run=True):
+            outcomes = []
+            for parsed in self.grammar.try_parse_line(text_input, self.macros):
+                outcomes.append(self.execute_parsed(parsed))
+                if not outcomes[-1].is_success:
+                    break
+        return self.combine_outcomes(outcomes)
+
+    def execute_action(self, action: Action, player: Player, thing=None) -> Outcome:
+        """Execute the action the player gave on the thing, then fire the rules matching what happened.
+
+        Attempts are counted per player and action name, as actions such as those of directions are
+        shared by every game.
+        """
+        if not in_dry_run():
+            player.action_counts[action.name] = player.action_counts.get(action.name, 0) + 1
+        location = player.location
+        outcome = action.try_execute(player)
+        if outcome.is_success:
+            messages = self.rules.fire_for_action(action, thing, player, location)
+            if messages:
+                outcome.result = Result('\n'.join([str(outcome.result)] + messages))
+        return outcome
 
         # if self.continued_action is not None or self.grammar.parse(text_input):
         #     if self.continued_action is None:
@@ -125,6 +250,114 @@ class TextGameSinglePlayer:
 # #     * You can't do that, etc.)
 #                 return ResultFailure("I don't know that word.")
 
+    @property
+    def item_containers(self) -> List[ItemContainerThing]:
+        return [self.player]
+
+    @property
+    def spawnable_items(self) -> Dict[str, Callable[['TextGameSinglePlayer'], Item]]:
+        """Return the factories of the items this game can create while it runs, by item name.
+        """
+        return {}
+
+    def spawn_item(self, name: str) -> Item:
+        """Return the item of the given name created while the game runs, creating it the first time.
+
+        There is one item of each spawnable name per game, so undoing and repeating the command that
+        spawned it brings back the same item, which commands can refer to.
+        """
+        item = self.items_by_name.get(name)
+        if item is None:
+            item = self.items_by_name[name] = self.spawnable_items[name](self)
+            self.grammar.add_thing(item)
+        return item
+
+    def snapshot(self) -> dict:
+        """Return a snapshot of the mutable game state, from which the game can later be restored.
+        """
+        return {
+            'location': self.player.location,
+            'items': {container: container.snapshot_items() for container in self.item_containers},
+            'turns': self.turns,
+            'is_ended': self.is_ended,
+            'is_won': self.is_won,
+        }
+
+    def restore(self, snapshot: dict):
+        """Restore the mutable game state from the given snapshot.
+        """
+        record_state(self)
+        self.player.location = snapshot['location']
+        for container, items in snapshot['items'].items():
+            container.restore_items(items)
+        self.turns = snapshot.get('turns', self.turns)
+        self.is_ended = snapshot.get('is_ended', self.is_ended)
+        self.is_won = snapshot.get('is_won', self.is_won)
+
+    def transaction_state(self) -> tuple:
+        """Return the game state outside item containers, which a transaction restores when it rolls back.
+        """
+        return self.turns, self.is_ended, self.is_won
+
+    def restore_transaction_state(self, state: tuple):
+        self.turns, self.is_ended, self.is_won = state
+
+    def export_state(self) -> dict:
+        """Return the mutable game state as plain data, with things referred to by name.
+        """
+        snapshot = self.snapshot()
+        return {
+            'location': snapshot['location'].name,
+            'items': {
+                container.name: [item.name for item in items] for container, items in snapshot['items'].items()
+            },
+            'macros': dict(self.macros),
+        }
+
+    def import_state(self, state: dict):
+        """Restore the mutable game state from plain data returned by export_state.
+
+        Items the state holds that this game has not had yet are spawned.
+        """
+        containers_by_name = {container.name: container for container in self.item_containers}
+        items_by_name = dict(self.items_by_name)
+        items_by_name.update(
+            (item.name, item) for container in self.item_containers for item in container.inventory
+        )
+        for item_names in state['items'].values():
+            for item_name in item_names:
+                if item_name not in items_by_name:
+                    items_by_name[item_name] = self.spawn_item(item_name)
+        self.player.location = containers_by_name[state['location']]
+        self.macros = dict(state.get('macros', {}))
+        for name, item_names in state['items'].items():
+            containers_by_name[name].restore_items(items_by_name[item_name] for item_name in item_names)
+        self.history = CommandHistory(game=self)
+
+    def attach_journal(self, journal, session_id: str):
+        """Append every command this game accepts to the given journal, under the given session id.
+        """
+        self.journal = journal
+        self.session_id = session_id
+
+    def attach_telemetry(self, telemetry, session_id: str=None):
+        """Record every command given to this game, with its outcome and latency, in the given telemetry log.
+        """
+        self.telemetry = telemetry
+        if session_id is not None:
+            self.session_id = session_id
+
+    def close(self):
+        """End this session and detach it from the logs it shares with other sessions.
+
+        Games hold no reference cycles, so once closed and dropped a game is freed right away, without
+        waiting for the cyclic garbage collector.
+        """
+        self.is_ended = True
+        self.journal = None
+        self.telemetry = None
+        self.continued_action = None
+
     def end_turn(self):
         if self.continued_action is None:
             # completes a turn if the action is not being continued, getting more input
@@ -151,36 +384,95 @@ class TextGameSinglePlayer:
         game_actions = [
             LookAction(),
             InventoryAction(),
+            UndoAction(),
+            RedoAction(),
         ]
         game_actions.extend(self.get_direction_actions())
         return game_actions
 
     @staticmethod
     def get_direction_actions():
-        def east(player):
-            return GoAction(direction=all_directions.lookup('east')).execute(player=player)
+        return [direction.go_action for direction in all_directions.values()]
 
-        def west(player):
-            return GoAction(direction=all_directions.lookup('west')).execute(player=player)
 
-        def north(player):
-            return GoAction(direction=all_directions.lookup('north')).execute(player=player)
+class TextGameMultiPlayer:
+    """Many players sharing the world of a single player game, each command locking only the places it touches.
 
-        def south(player):
-            return GoAction(direction=all_directions.lookup('south')).execute(player=player)
+    Commands of one player are serialized by a lock of that player. Commands of different players only wait
+    for each other when they touch the same places, so throughput scales with players spread across the map.
+    """
 
-        def up(player):
-            return GoAction(direction=all_directions.lookup('up')).execute(player=player)
+    def __init__(self, world: TextGameSinglePlayer):
+        super().__init__()
+        self.world = world
+        self.world.events = EventBus()
+        self.places = [container for container in world.item_containers if isinstance(container, Place)]
+        self.place_locks = {place: threading.Lock() for place in self.places}
+        self.place_order = {place: number for number, place in enumerate(self.places)}
+        self.player_locks: Dict[Player, threading.Lock] = {}
+        self.players_by_name: Dict[str, Player] = {}
+        self._players_lock = threading.Lock()
 
-        def down(player):
-            return GoAction(direction=all_directions.lookup('down')).execute(player=player)
+    def join(self, name: str) -> Player:
+        """Add a new player to the world, at the starting location.
+        """
+        player = Player(game=self.world, name=name, initial_location=self.world.starting_location)
+        with self._players_lock:
+            self.players_by_name[name] = player
+            self.player_locks[player] = threading.Lock()
+        self.events.subscribe(player.location, player)
+        player.announce('arrives')
+        return player
 
-        direction_actions = [
-            Action(east, aliases=['e']),
-            Action(west, aliases=['w']),
-            Action(north, aliases=['n']),
-            Action(south, aliases=['s']),
-            Action(up, aliases=['u']),
-            Action(down, aliases=['d']),
-        ]
-        return direction_actions
+    def leave(self, player: Player):
+        """Remove the player from the world, once any command it is executing is done.
+        """
+        with self.player_locks[player]:
+            with self.lock_places([player.location]):
+                player.announce('leaves')
+                self.events.unsubscribe(player.location, player)
+            with self._players_lock:
+                del self.players_by_name[player.name]
+                del self.player_locks[player]
+
+    @property
+    def events(self) -> EventBus:
+        return self.world.events
+
+    def watch(self, place: Place, spectator):
+        """Let a spectator see what happens in the given place.
+        """
+        self.events.subscribe(place, spectator)
+
+    @contextmanager
+    def lock_places(self, places: Optional[Iterable[Place]]):
+        """Hold the locks of the given places, or of every place if None, always acquired in the same order.
+        """
+        if places is None:
+            places = self.places
+        with ExitStack() as stack:
+            for place in sorted(set(places), key=self.place_order.get):
+                stack.enter_context(self.place_locks[place])
+            yield
+
+    def try_take_turn(self, player: Player, text_input) -> Outcome:
+        """Parse and execute the given text input for the player and return its outcome, without raising on failure.
+        """
+        player_lock = self.player_locks.get(player)
+        if player_lock is None:
+            return Outcome(OutcomeStatus.ACTION_FAILED, refusal=Refusal(GamePlayerNotInGameError))
+        outcome = self.world.grammar.try_parse(text_input)
+        if not outcome.is_success:
+            outcome.refusal = Refusal(game_errors_by_parse_status[outcome.status])
+            return outcome
+        with player_lock:
+            if player not in self.player_locks:
+                return Outcome(OutcomeStatus.ACTION_FAILED, refusal=Refusal(GamePlayerNotInGameError))
+            with self.lock_places(outcome.action.places_touched(player)):
+                return self.world.execute_action(outcome.action, player, thing=outcome.thing)
+
+    def take_turn(self, player: Player, text_input):
+        outcome = self.try_take_turn(player, text_input)
+        if outcome.error is not None:
+            raise outcome.error
+        return outcome.result
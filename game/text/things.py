@@ -1,6 +1,12 @@
 import inspect
+import weakref
 from abc import ABC, abstractmethod
-from typing import Iterable, MutableMapping, TypeVar, Generic, AnyStr, Callable
+from typing import Dict, Iterable, List, MutableMapping, TypeVar, Generic, AnyStr, Callable, Optional
+
+from game.text import tracing
+from game.text.persistent import PersistentDict, PersistentMap, PersistentSequence
+from game.text.results import Outcome, OutcomeStatus, Refusal
+from game.text.transactions import Transaction, in_dry_run, record_mutation
 
 
 class GameError(Exception):
@@ -82,6 +88,12 @@ class IndexOfThings(Index[AnyStr, T]):
         key = Thing.get_prefix(index_key.lower())
         return self[key]
 
+    def find(self, index_key: str) -> Optional[T]:
+        """Look up and return a thing by the given index key, or None if nothing matches.
+        """
+        key = Thing.get_prefix(index_key.lower())
+        return self._index.get(self.__keytransform__(key))
+
     def add_thing(self, thing: T):
         """Add a thing to this index of things.
         """
@@ -89,10 +101,15 @@ class IndexOfThings(Index[AnyStr, T]):
             self[index_key] = thing
 
     def add_things(self, things: Iterable[T]):
-        """Add a list of things to this index of things.
+        """Add a list of things to this index of things, all at once or not at all.
         """
+        added = {}
         for thing in things:
-            self.add_thing(thing)
+            for index_key in thing.index_keys:
+                if index_key in self._index or index_key in added:
+                    raise ThingAlreadyInIndexError(thing=thing)
+                added[index_key] = thing
+        self._index.update(added)
 
     def remove_thing(self, thing):
         """Remove a thing from this index of things.
@@ -100,8 +117,23 @@ class IndexOfThings(Index[AnyStr, T]):
         for index_key in thing.index_keys:
             del self[index_key]
 
+    def remove_things(self, things: Iterable[T]):
+        """Remove a list of things from this index of things, all at once or not at all.
+        """
+        removed = [index_key for thing in things for index_key in thing.index_keys]
+        for index_key in removed:
+            if index_key not in self._index:
+                raise KeyError(index_key)
+        for index_key in removed:
+            del self._index[index_key]
+
+    def has_thing(self, thing: T) -> bool:
+        """Return whether the given thing is in this index of things.
+        """
+        return self._index.get(thing.index_key) is thing
+
     def values(self):
-        return list(set(super().values()))
+        return list(dict.fromkeys(super().values()))
 
     def keys(self):
         return list(super().keys())
@@ -110,6 +142,77 @@ class IndexOfThings(Index[AnyStr, T]):
         return ','.join(str(thing) for thing in self.values())
 
 
+class ThingsSnapshot:
+    """Frozen version of a persistent index of things, iterating over its things in the order they were added.
+    """
+    __slots__ = ('index', 'positions', 'sequence')
+
+    def __init__(self, index: PersistentMap, positions: PersistentMap, sequence: PersistentSequence):
+        self.index = index
+        self.positions = positions
+        self.sequence = sequence
+
+    def __iter__(self):
+        return iter(self.sequence)
+
+    def __len__(self):
+        return len(self.sequence)
+
+
+class PersistentIndexOfThings(IndexOfThings):
+    """Index of things backed by persistent maps, so any version of it can be kept and restored in O(1).
+
+    The things are also kept in a persistent sequence in the order they were added, so listing them takes
+    no sort. Once the sequence is full, the things are numbered again from zero in a sequence with as much
+    room again, so renumbering costs O(log n) per added thing on average.
+    """
+    def __init__(self, things: Iterable[T]=None):
+        super().__init__()
+        self._index = PersistentDict()
+        self._positions = PersistentMap()
+        self._sequence = PersistentSequence()
+        if things is not None:
+            self.add_things(things)
+
+    def add_thing(self, thing: T):
+        self.add_things([thing])
+
+    def add_things(self, things: Iterable[T]):
+        things = list(things)
+        super().add_things(things)
+        positions, sequence = self._positions, self._sequence
+        if sequence.end + len(things) > sequence.capacity:
+            sequence = PersistentSequence(sequence, capacity=2 * (len(sequence) + len(things)))
+            positions = PersistentMap({thing: position for position, thing in enumerate(sequence)})
+        for thing in things:
+            positions = positions.set(thing, sequence.end)
+            sequence = sequence.append(thing)
+        self._positions, self._sequence = positions, sequence
+
+    def remove_thing(self, thing: T):
+        self.remove_things([thing])
+
+    def remove_things(self, things: Iterable[T]):
+        things = list(things)
+        super().remove_things(things)
+        positions, sequence = self._positions, self._sequence
+        for thing in things:
+            sequence = sequence.delete(positions[thing])
+            positions = positions.delete(thing)
+        self._positions, self._sequence = positions, sequence
+
+    def values(self):
+        return list(self._sequence)
+
+    def snapshot(self) -> ThingsSnapshot:
+        return ThingsSnapshot(self._index.snapshot(), self._positions, self._sequence)
+
+    def restore(self, snapshot: ThingsSnapshot):
+        self._index.restore(snapshot.index)
+        self._positions = snapshot.positions
+        self._sequence = snapshot.sequence
+
+
 class Thing(ABC):
     def __init__(self, game, name, aliases=None):
         super().__init__()
@@ -117,6 +220,25 @@ class Thing(ABC):
         self.name = name
         self.aliases = aliases or []
         self.index_keys = self.generate_index_keys()
+        self.index_key = self.get_index_key(self.get_prefix(name))
+
+    @property
+    def game(self):
+        """Return the game of this thing, held by a weak reference so the game and its things form no cycle.
+
+        A thing does not keep its game alive, so whoever uses a thing must also hold on to its game. Using the
+        game of a thing after the game was freed raises ReferenceError.
+        """
+        if self._game is None:
+            return None
+        game = self._game()
+        if game is None:
+            raise ReferenceError(f'The game of {self} was freed while {self.name} was still in use')
+        return game
+
+    @game.setter
+    def game(self, game):
+        self._game = weakref.ref(game) if game is not None else None
 
     def generate_index_keys(self):
         return {self.get_index_key(self.get_prefix(alias)) for alias in [self.name] + self.aliases}
@@ -133,14 +255,25 @@ class Thing(ABC):
         """
         return text.lower()
 
+    def find_action(self, name) -> Optional['Action']:
+        """Return the action with the given name for this thing, or None if it has no such action.
+        """
+        return None
+
+    def get_action(self, name) -> 'Action':
+        action = self.find_action(name)
+        if action is None:
+            raise KeyError(name)
+        return action
+
     def __str__(self):
         cls = inspect.getmro(self.__class__)[1]
         return f'{cls.__name__}({self.name})'
 
 
 class ActionableThing(Thing, ABC):
-    def get_action(self, name) -> 'Action':
-        return self.actions.lookup(name)
+    def find_action(self, name) -> Optional['Action']:
+        return self.actions.find(name)
 
     @property
     @abstractmethod
@@ -149,7 +282,18 @@ class ActionableThing(Thing, ABC):
 
     @property
     def actions(self):
-        return IndexOfThings(self._actions)
+        """Return the index of the actions of this thing, built once per game.
+
+        The index is kept by the game rather than by this thing: its actions refer to this thing, so keeping
+        it here would make every thing part of a reference cycle.
+        """
+        game = self.game
+        if game is None:
+            return IndexOfThings(self._actions)
+        actions = game.actions_by_thing.get(self)
+        if actions is None:
+            actions = game.actions_by_thing[self] = IndexOfThings(self._actions)
+        return actions
 
 
 class DescribableThing(Thing):
@@ -162,31 +306,67 @@ class DescribableThing(Thing):
 class ItemContainerThing(Thing, ABC):
     def __init__(self, game, name, aliases=None, items: Iterable['Item']=None):
         super().__init__(game, name, aliases=aliases)
-        self.items = IndexOfThings(items or [])
+        self.items = PersistentIndexOfThings(items or [])
+        self.version = 0
 
     @property
     def inventory(self):
         return self.items.values()
 
     def add_item(self, item: 'Item'):
+        record_mutation(self)
         self.items.add_thing(item)
+        self.version += 1
         return self
 
     def remove_item(self, item: 'Item'):
+        record_mutation(self)
         self.items.remove_thing(item)
+        self.version += 1
+        return self
+
+    def add_items(self, items: Iterable['Item']):
+        record_mutation(self)
+        self.items.add_things(items)
+        self.version += 1
+        return self
+
+    def remove_items(self, items: Iterable['Item']):
+        record_mutation(self)
+        self.items.remove_things(items)
+        self.version += 1
         return self
 
     def has_item(self, item: 'Item'):
-        return item in self.items.values()
+        return self.items.has_thing(item)
 
     def has(self, item: 'Item'):
         return self.has_item(item)
 
+    def snapshot_items(self) -> ThingsSnapshot:
+        return self.items.snapshot()
+
+    def restore_items(self, items: Iterable['Item']):
+        record_mutation(self)
+        if isinstance(items, ThingsSnapshot):
+            self.items.restore(items)
+        else:
+            self.items = PersistentIndexOfThings(items)
+        self.version += 1
+
 
 class Direction(Thing, ABC):
     def __init__(self, name, aliases=None):
         super().__init__(game=None, name=name, aliases=aliases)
-        self.opposite = None
+        self._opposite = None
+
+    @property
+    def opposite(self) -> Optional['Direction']:
+        return self._opposite() if self._opposite is not None else None
+
+    @opposite.setter
+    def opposite(self, direction: Optional['Direction']):
+        self._opposite = weakref.ref(direction) if direction is not None else None
 
     @classmethod
     def create_dimension(cls, name, opposite_name, aliases=None, opposite_aliases=None):
@@ -196,9 +376,6 @@ class Direction(Thing, ABC):
         opposite_direction.opposite = direction
         return direction, opposite_direction
 
-    def get_action(self, name):
-        raise KeyError()
-
     def __str__(self):
         return f'{self.__class__.__name__}({self.name})'
 
@@ -213,13 +390,19 @@ class Item(ActionableThing, DescribableThing, ABC):
 
 class Place(ItemContainerThing, DescribableThing):
     def __init__(self, game, name, aliases=None, items: Iterable[Item]=None, connections: Iterable['Connection']=None):
-        super().__init__(game, name, aliases=aliases)
-        self.items = IndexOfThings(items or [])
+        super().__init__(game, name, aliases=aliases, items=items)
         self.connections = IndexOfConnections(connections or [])
+        self.destinations_by_direction: Dict[Direction, weakref.ref] = {
+            connection.direction: weakref.ref(connection.to_place) for connection in self.connections.values()
+        }
         self.general_description = None
+        self._description = None
+        self._description_key = None
 
     def connect_to(self, place: 'Place', direction: Direction, reverse_direction=True):
         self.connections.add_thing(Connection(to_place=place, direction=direction))
+        self.destinations_by_direction[direction] = weakref.ref(place)
+        self.version += 1
         if reverse_direction is True:
             reverse_direction = direction.opposite
         if reverse_direction is not None:
@@ -230,17 +413,23 @@ class Place(ItemContainerThing, DescribableThing):
         return [connection.direction for connection in self.connections.values()]
 
     def get_exit_destination(self, direction):
-        connection = self.connections.get_by_direction(direction)
-        if connection is not None:
-            return connection.to_place
-        return None
+        destination = self.destinations_by_direction.get(direction)
+        return destination() if destination is not None else None
 
     @property
     def description(self):
+        description_key = (self.version, self.general_description)
+        if self._description_key != description_key:
+            with tracing.span('render', place=self.name):
+                self._description = self.describe(self.inventory, self.obvious_exits)
+            self._description_key = description_key
+        return self._description
+
+    def describe(self, items: Iterable[Item], exits: Iterable[Direction]) -> str:
         description = f'{self.general_description}. You see:'
-        for item in self.inventory:
+        for item in items:
             description += f'\n{item.name}'
-        exits_list = ' '.join(direction.name for direction in self.obvious_exits)
+        exits_list = ' '.join(direction.name for direction in exits)
         if exits_list == '':
             exits_list = 'None'
         description += '\nObvious exits are: ' + exits_list
@@ -250,9 +439,15 @@ class Place(ItemContainerThing, DescribableThing):
 class Connection(Thing):
     def __init__(self, to_place: Place, direction: Direction):
         super().__init__(game=to_place.game, name=to_place.name, aliases=to_place.aliases)
-        self.to_place = to_place
+        self._to_place = weakref.ref(to_place)
         self.direction = direction
 
+    @property
+    def to_place(self) -> Place:
+        """Return the place this connection leads to, held by a weak reference so connected places form no cycle.
+        """
+        return self._to_place()
+
     def __str__(self):
         return f'{self.__class__.__name__}({self.to_place},{self.direction})'
 
@@ -270,18 +465,124 @@ class Actor(ItemContainerThing):
     pass
 
 
+class Scope:
+    """Items and exits within reach of a player, computed once and shared until the player or location changes.
+    """
+    def __init__(self, player: 'Player'):
+        super().__init__()
+        self.location = player.location
+        self.player_version = player.version
+        self.carried_items = player.items.values()
+        self._carried = set(self.carried_items)
+        if self.location is None:
+            self.location_version = None
+            self.visible_items = []
+            self.destinations_by_direction = {}
+        else:
+            self.location_version = self.location.version
+            self.visible_items = self.location.inventory
+            self.destinations_by_direction = self.location.destinations_by_direction
+        self._visible = set(self.visible_items)
+        self._description = None
+
+    @property
+    def exits(self) -> Iterable[Direction]:
+        return list(self.destinations_by_direction)
+
+    def is_current(self, player: 'Player') -> bool:
+        return (
+            player.location is self.location
+            and player.version == self.player_version
+            and (self.location is None or self.location.version == self.location_version)
+        )
+
+    def carries(self, item: Item) -> bool:
+        return item in self._carried
+
+    def sees(self, item: Item) -> bool:
+        return item in self._visible
+
+    def get_exit_destination(self, direction: Direction) -> Optional[Place]:
+        destination = self.destinations_by_direction.get(direction)
+        return destination() if destination is not None else None
+
+    @property
+    def description(self) -> Optional[str]:
+        """Return what the player sees looking around, rendered once per version of the location.
+        """
+        if self._description is None and self.location is not None:
+            self._description = self.location.description
+        return self._description
+
+
 class Player(Actor):
     def __init__(self, game, name, initial_location: Place=None):
         super().__init__(game, name)
         self.location: Place = initial_location
+        self.action_counts: Dict[str, int] = {}
+        self._scope = None
+
+    @property
+    def scope(self) -> Scope:
+        """Return the scope of this player, recomputing it only when the player or location has changed.
+        """
+        if self._scope is None or not self._scope.is_current(self):
+            self._scope = Scope(self)
+        return self._scope
+
+    @property
+    def inventory(self):
+        return list(self.scope.carried_items)
+
+    def has(self, item: 'Item'):
+        return self.scope.carries(item)
+
+    def sees(self, item: 'Item'):
+        return self.scope.sees(item)
+
+    @property
+    def event_bus(self):
+        """Return the event bus of the game, or None if there is none or the player only simulates commands.
+        """
+        if in_dry_run():
+            return None
+        return self.game.events
+
+    def announce(self, message: str):
+        """Tell everyone else in the location of this player what the player does.
+        """
+        events = self.event_bus
+        if events is not None:
+            events.publish(self.location, f'{self.name} {message}', source=self)
+
+    def move_to(self, place: Place):
+        events = self.event_bus
+        if events is not None:
+            self.announce('leaves')
+            events.move(self, self.location, place)
+        self.location = place
+        if events is not None:
+            self.announce('arrives')
 
     def get(self, item: 'Item'):
-        self.location.remove_item(item)
-        return self.add_item(item)
+        with Transaction():
+            self.location.remove_item(item)
+            return self.add_item(item)
 
     def drop(self, item: 'Item'):
-        self.location.add_item(item)
-        return self.remove_item(item)
+        with Transaction():
+            self.location.add_item(item)
+            return self.remove_item(item)
+
+    def get_items(self, items: Iterable['Item']):
+        with Transaction():
+            self.location.remove_items(items)
+            return self.add_items(items)
+
+    def drop_items(self, items: Iterable['Item']):
+        with Transaction():
+            self.location.add_items(items)
+            return self.remove_items(items)
 
 
 class ActionError(GameError):
@@ -303,25 +604,73 @@ class ActionRequiresItemInLocationError(ActionOnItemError):
 
 
 class Action(Thing):
+    is_recorded = True
 
-    def __init__(self, strategy: Callable[[Player], Result], item: Item=None, aliases=None):
-        name = strategy.__name__
+    def __init__(self, strategy: Callable[[Player], Result], item: Item=None, aliases=None, name=None):
+        name = name or strategy.__name__
         super().__init__(game=None, name=name, aliases=aliases)
-        self.count = 0
         self.strategy = strategy
         self.item = item
 
     def execute(self, player: Player) -> Result:
-        self.count += 1
-        self.validate_player_can_execute(player)
-        return self.strategy(player)
+        outcome = self.try_execute(player)
+        if outcome.error is not None:
+            raise outcome.error
+        return outcome.result
+
+    def try_execute(self, player: Player) -> Outcome:
+        """Execute this action for the player and return its outcome, without raising on failure.
+        """
+        with tracing.span('validate', action=self.name):
+            refusal = self.refusal(player)
+        if refusal is not None:
+            return Outcome(OutcomeStatus.ACTION_FAILED, action=self, thing=self.item, refusal=refusal)
+        try:
+            with tracing.span('execute', action=self.name), Transaction(player):
+                result = self.strategy(player)
+        except ActionError as error:
+            refusal = Refusal(type(error), getattr(error, 'thing', None))
+            return Outcome(
+                OutcomeStatus.ACTION_FAILED, action=self, thing=self.item, refusal=refusal,
+                error=error.with_traceback(None),
+            )
+        return Outcome(OutcomeStatus.OK, action=self, thing=self.item, result=result)
+
+    def dry_run(self, player: Player) -> Outcome:
+        """Return the outcome executing this action would have for the player, leaving the game unchanged.
+        """
+        with Transaction(player, dry_run=True):
+            return self.try_execute(player)
+
+    def places_touched(self, player: Player) -> Optional[List[Place]]:
+        """Return the places this action may read or change for the player, or None if it may touch any place.
+        """
+        return [player.location]
 
     def validate_player_can_execute(self, player: Player):
-        if self.item is not None:
-            if self.item.must_possess and not player.has(self.item):
-                raise ActionRequiresItemPossessionError(self.item)
-            if not self.item.must_possess and self.item.must_be_in_location and not player.location.has(self.item):
-                raise ActionRequiresItemInLocationError(self.item)
+        error = self.validation_error(player)
+        if error is not None:
+            raise error
+
+    def validation_error(self, player: Player) -> Optional[ActionError]:
+        refusal = self.refusal(player)
+        return refusal.error if refusal is not None else None
+
+    def refusal(self, player: Player) -> Optional[Refusal]:
+        """Return why the player cannot execute this action, or None if it can be executed.
+        """
+        return self.item_refusal(player, self.item)
+
+    @classmethod
+    def item_refusal(cls, player: Player, item: Optional[Item]) -> Optional[Refusal]:
+        """Return why the player cannot execute this kind of action on the given item, or None if it can.
+        """
+        if item is not None:
+            if item.must_possess and not player.has(item):
+                return Refusal(ActionRequiresItemPossessionError, item)
+            if not item.must_possess and item.must_be_in_location and not player.sees(item):
+                return Refusal(ActionRequiresItemInLocationError, item)
+        return None
 
     def next_action(self) -> 'Action':
         pass
\ No newline at end of file
@@ -0,0 +1,79 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import List, Optional
+
+_no_span = nullcontext()
+_tracer: Optional['Tracer'] = None
+
+
+class Span:
+    """Times one phase of a turn and records it with the tracer as a complete trace event.
+    """
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        self.tracer.events.append({
+            'name': self.name,
+            'ph': 'X',
+            'ts': (self.start - self.tracer.origin) / 1000,
+            'dur': (end - self.start) / 1000,
+            'pid': self.tracer.pid,
+            'tid': threading.get_ident(),
+            'args': self.args,
+        })
+        return False
+
+
+class Tracer:
+    """Collects the spans of traced turns and exports them as Chrome trace event JSON.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.events: List[dict] = []
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    def span(self, name: str, **args) -> Span:
+        return Span(self, name, args)
+
+    def to_json(self) -> dict:
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump(self.to_json(), trace_file)
+
+
+def span(name: str, **args):
+    """Return a span timing the named phase, or a no-op context when tracing is disabled.
+    """
+    if _tracer is None:
+        return _no_span
+    return _tracer.span(name, **args)
+
+
+def enable() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
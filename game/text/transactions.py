@@ -0,0 +1,90 @@
+import threading
+from typing import Dict, List, Optional
+
+
+class _ActiveTransactions(threading.local):
+    def __init__(self):
+        super().__init__()
+        self.stack: List['Transaction'] = []
+
+
+_active = _ActiveTransactions()
+
+
+def record_mutation(container):
+    """Remember the items of the given container in every active transaction, before the container changes.
+    """
+    for transaction in _active.stack:
+        transaction.record(container)
+
+
+def record_state(owner):
+    """Remember the transaction state of the given owner in every active transaction, before that state changes.
+    """
+    for transaction in _active.stack:
+        transaction.record_state(owner)
+
+
+def in_dry_run() -> bool:
+    """Return whether the current thread only simulates what it executes.
+    """
+    return any(transaction.dry_run for transaction in _active.stack)
+
+
+class Transaction:
+    """Changes to item containers made by the current thread while it is active, which it can undo in O(changes).
+
+    Each container records the persistent snapshot of its items the first time it changes, so entering a
+    transaction copies nothing and rolling back restores only the containers that changed, along with the
+    location of the player. State outside item containers, such as the clock of the game or the position
+    in its command history, is recorded the same way by its owner. Leaving it with an error rolls back;
+    a dry run always rolls back.
+    """
+
+    __slots__ = ('player', 'location', 'dry_run', 'snapshots', 'states')
+
+    def __init__(self, player=None, dry_run: bool=False):
+        self.player = player
+        self.location = player.location if player is not None else None
+        self.dry_run = dry_run
+        self.snapshots: Dict[object, object] = {}
+        self.states: Dict[object, object] = {}
+
+    @staticmethod
+    def current() -> Optional['Transaction']:
+        stack = _active.stack
+        return stack[-1] if stack else None
+
+    def record(self, container):
+        if container not in self.snapshots:
+            self.snapshots[container] = container.snapshot_items()
+
+    def record_state(self, owner):
+        if owner not in self.states:
+            self.states[owner] = owner.transaction_state()
+
+    def commit(self):
+        self.snapshots = {}
+        self.states = {}
+
+    def rollback(self):
+        snapshots, self.snapshots = self.snapshots, {}
+        states, self.states = self.states, {}
+        for container, items in snapshots.items():
+            container.restore_items(items)
+        for owner, state in states.items():
+            owner.restore_transaction_state(state)
+        if self.player is not None:
+            self.player.location = self.location
+
+    def __enter__(self) -> 'Transaction':
+        _active.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active.stack.pop()
+        if exc_type is not None or self.dry_run:
+            self.rollback()
+        else:
+            self.commit()
+        return False
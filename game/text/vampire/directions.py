@@ -3,12 +3,14 @@ from game.text.actions import GoAction
 
 
 class VampireDirection(Direction):
+    def __init__(self, name, aliases=None):
+        super().__init__(name, aliases=aliases)
+        self.go_action = GoAction(direction=self, name=name.lower(), aliases=[alias.lower() for alias in self.aliases])
 
-    def get_action(self, name):
+    def find_action(self, name):
         if name == 'go':
-            return GoAction(direction=self)
-        else:
-            raise KeyError()
+            return self.go_action
+        return None
 
 
 east, west = VampireDirection.create_dimension(name='East', aliases=['E'], opposite_name='West', opposite_aliases=['W'])
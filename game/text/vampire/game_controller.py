@@ -1,10 +1,12 @@
 from typing import List
 
 import game.text.vampire.directions as directions
+from game.text.actions import AllItems
 from game.text.grammars import SimpleGrammar
 from game.text.text_games import TextGameSinglePlayer
 from game.text.things import Thing, Action, Direction, Player, IndexOfThings
 from game.text.results import ResultSuccess
+from game.text.rules import Event, Rule
 from game.text.vampire import items, places
 
 
@@ -19,15 +21,44 @@ class Vampire(TextGameSinglePlayer):
 
         grammar = SimpleGrammar(things=self.all_things, raw_actions=self.game_actions)
         super().__init__('Vampire', grammar)
+        self.define_rules()
         self.dump_places()
 
     @property
     def starting_location(self):
         return self.places.lookup('Entrance Hall')
 
+    @property
+    def clock(self):
+        return self.time
+
     def connect_places(self):
         self.places.lookup('Entrance Hall').connect_to(self.places.lookup('Library'), direction=directions.east)
 
+    def define_rules(self):
+        library = self.places.lookup('Library')
+        for item in [library.items.lookup('Crate'), library.items.lookup('Brick Fireplace')]:
+            self.rules.add(Rule('hit', self.break_open, item=item, condition=self.can_break_open))
+
+    @staticmethod
+    def can_break_open(event: Event) -> bool:
+        return (
+            event.place.has(event.item)
+            and any(item.name == 'Axe' for item in event.player.inventory)
+            and not event.player.game.has_item('Wooden Stakes')
+        )
+
+    @staticmethod
+    def break_open(event: Event) -> str:
+        """Replace the item that was hit with the wooden stakes hidden in it.
+        """
+        event.place.add_item(event.player.game.spawn_item('Wooden Stakes'))
+        event.place.remove_item(event.item)
+        return f'The {event.item.name} breaks open!\n{event.place.description}'
+
+    def has_item(self, name) -> bool:
+        return any(item.name == name for container in self.item_containers for item in container.inventory)
+
     def welcome(self):
         return "Welcome to the VAMPIRE'S CASTLE Adventure\n\nDo you need the instructions? "
 
@@ -41,7 +72,7 @@ class Vampire(TextGameSinglePlayer):
             list_of_places = [
                 places.EntranceHall(
                     self,
-                    items=[items.Sign(self), items.Timepiece(self)],
+                    items=[items.Sign(self), items.Timepiece(self), items.Axe(self)],
                 ),
                 places.Library(
                     self,
@@ -51,6 +82,39 @@ class Vampire(TextGameSinglePlayer):
             self._places = IndexOfThings(list_of_places)
         return self._places
 
+    @property
+    def item_containers(self):
+        return super().item_containers + self.places.values()
+
+    @property
+    def spawnable_items(self):
+        return {'Wooden Stakes': items.WoodenStakes}
+
+    def snapshot(self):
+        snapshot = super().snapshot()
+        snapshot['time'] = self.time
+        return snapshot
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        self.time = snapshot['time']
+
+    def transaction_state(self):
+        return super().transaction_state(), self.time
+
+    def restore_transaction_state(self, state):
+        state, self.time = state
+        super().restore_transaction_state(state)
+
+    def export_state(self):
+        state = super().export_state()
+        state['time'] = self.time
+        return state
+
+    def import_state(self, state):
+        self.time = state['time']
+        super().import_state(state)
+
     @property
     def all_things(self) -> List[Thing]:
         if self._all_things is None:
@@ -58,6 +122,7 @@ class Vampire(TextGameSinglePlayer):
             for place in self.places.values():
                 self._all_things.extend(item for item in place.items.values())
             self._all_things.extend(direction for direction in self.directions.values())
+            self._all_things.append(AllItems())
         return self._all_things
 
     @property
@@ -39,6 +39,16 @@ class Timepiece(VampireItem):
         return f'The time is {self.game.time}.'
 
 
+class Axe(VampireItem):
+
+    def __init__(self, game):
+        super().__init__(game, 'Axe')
+
+    @property
+    def description(self):
+        return "A woodcutter's axe."
+
+
 class WoodenStakes(VampireItem):
 
     def __init__(self, game):
@@ -60,20 +70,10 @@ class BrickFireplace(VampireItem):
     @property
     def _actions(self):
 
-        def hit_with(player, item):
-            if player.location.has(self):
-                if item.name == 'Axe' and player.has(item) and not self.game.has_item('Wooden Stakes'):
-                    player.location.add_item(WoodenStakes(self.game))
-                    player.location.remove_item(self)
-                    return Result(player.location.do('look'))
-                return Result('Nothing happened\n')
-            return Result("I don't see any Fireplace")
-
         def hit(player):
-            if player.location.has(self):
-                return Result('      -- With what? ', next_action=Action(hit_with))
-            else:
-                return Result("I don't see any Crate")
+            if not any(item.name == 'Axe' for item in player.inventory):
+                return Result('      -- With what? ')
+            return Result(f'You hit the {self.name} with the Axe')
 
         return super()._actions + [
             Action(hit),
@@ -92,20 +92,10 @@ class Crate(VampireItem):
     @property
     def _actions(self):
 
-        def hit_with(player, item):
-            if player.location.has(self):
-                if item.name == 'Axe' and player.has(item) and not self.game.has_item('Wooden Stakes'):
-                    player.location.add_item(WoodenStakes(self.game))
-                    player.location.remove_item(self)
-                    return Result(player.location.do('look'))
-                return Result('Nothing happened\n')
-            return Result("I don't see any Crate")
-
         def hit(player):
-            if player.location.has(self):
-                return Result('      -- With what? ', next_action=Action(hit_with))
-            else:
-                return Result("I don't see any Crate")
+            if not any(item.name == 'Axe' for item in player.inventory):
+                return Result('      -- With what? ')
+            return Result(f'You hit the {self.name} with the Axe')
 
         return super()._actions + [
             Action(hit),
@@ -1,14 +1,23 @@
+from game.text.actions import GetAllAction
 from game.text.things import Place
 
 
-class EntranceHall(Place):
+class VampirePlace(Place):
+
+    def find_action(self, name):
+        if name == 'get all':
+            return GetAllAction(place=self)
+        return None
+
+
+class EntranceHall(VampirePlace):
 
     def __init__(self, game, items=None):
         super().__init__(game, 'Entrance Hall', items=items)
         self.general_description = 'A dark and spooky entrance hall...'
 
 
-class Library(Place):
+class Library(VampirePlace):
 
     def __init__(self, game, items=None):
         super().__init__(game, 'Library', items=items)
@@ -18,6 +18,7 @@ class GameTestCase(unittest.TestCase):
         player_mock: Player = Mock()
         player_mock.has.return_value = False
         player_mock.location = self._get_place_mock()
+        player_mock.sees.side_effect = lambda item: player_mock.location.has(item)
         return player_mock
 
     def _get_place_mock(self) -> Place:
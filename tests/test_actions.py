@@ -1,7 +1,8 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from game.text.things import Item, Player
-from game.text.actions import LookAction, GetAction, DropAction, InventoryAction
+from game.text.actions import LookAction, GetAction, DropAction, InventoryAction, GetAllAction, DropAllAction
+from game.text.vampire.game_controller import Vampire
 from tests import GameTestCase
 
 
@@ -9,14 +10,14 @@ class TestLookAtItemAction(GameTestCase):
 
     def setUp(self):
         super().setUp()
-        self.player_mock: Player = Mock()
+        self.player_mock: Player = self._get_player_mock()
         self.item_mock: Item = Mock()
         self.item_mock.name = 'Cthulhu'
         self.item_mock.description = 'A color out of space'
         self.action = LookAction(item=self.item_mock)
 
     def test__execute__returns_description_of_player_location__when_no_item_is_specified(self):
-        self.player_mock.location.description = 'A faraway place'
+        self.player_mock.scope.description = 'A faraway place'
         self.assertEqual('A faraway place', str(LookAction(item=None).execute(player=self.player_mock)))
 
     def test__execute__returns_description_of_item__when_possession_not_required_and_item_in_player_location(self):
@@ -66,7 +67,7 @@ class TestGetAction(GameTestCase):
 
     def setUp(self):
         super().setUp()
-        self.player_mock: Player = Mock()
+        self.player_mock: Player = self._get_player_mock()
         self.item_mock: Item = Mock()
         self.item_mock.name = 'Widget'
         self.action = GetAction(item=self.item_mock)
@@ -111,6 +112,14 @@ class TestGetAction(GameTestCase):
         self.player_mock.location.has.return_value = False
         self.assertRaisesWithMessage("I don't see any Widget", self.action.execute, player=self.player_mock)
 
+    def test__execute__raises_message_i_dont_see_any__when_item_must_be_possessed_and_is_not_in_player_location(self):
+        self.item_mock.is_fixed = False
+        self.item_mock.must_possess = True
+        self.item_mock.must_be_in_location = True
+        self.player_mock.has.return_value = False
+        self.player_mock.location.has.return_value = False
+        self.assertRaisesWithMessage("I don't see any Widget", self.action.execute, player=self.player_mock)
+
     def test__execute__gets_item_for_player(self):
         self.item_mock.is_fixed = False
         self.player_mock.has.return_value = False
@@ -122,7 +131,7 @@ class TestDropAction(GameTestCase):
 
     def setUp(self):
         super().setUp()
-        self.player_mock: Player = Mock()
+        self.player_mock: Player = self._get_player_mock()
         self.item_mock: Item = Mock()
         self.item_mock.name = 'Widget'
         self.action = DropAction(item=self.item_mock)
@@ -140,11 +149,77 @@ class TestDropAction(GameTestCase):
         self.assertRaisesWithMessage("You don't have it", self.action.execute, player=self.player_mock)
 
 
+class TestGetAllAction(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.player_mock = self._get_player_mock()
+        self.widget = self._get_item_mock()
+        self.widget.must_possess = False
+        self.anvil = self._get_item_mock()
+        self.anvil.name = 'Anvil'
+        self.anvil.is_fixed = True
+        self.player_mock.location.inventory = self.player_mock.location.items = [self.widget, self.anvil]
+        self.action = GetAllAction()
+
+    def test__execute__gets_movable_items_in_single_batch(self):
+        self.action.execute(player=self.player_mock)
+        self.player_mock.get_items.assert_called_once_with([self.widget])
+
+    def test__execute__returns_result_for_each_item(self):
+        self.assertEqual(
+            "Widget: OK, you got the Widget\nAnvil: You can't get it",
+            str(self.action.execute(player=self.player_mock)),
+        )
+
+    def test__execute__raises_result_for_each_item__when_no_item_can_be_gotten(self):
+        self.player_mock.location.inventory = [self.anvil]
+        self.assertRaisesWithMessage("Anvil: You can't get it", self.action.execute, player=self.player_mock)
+        self.player_mock.get_items.assert_not_called()
+
+    def test__execute__raises_message_nothing_here__when_location_has_no_items(self):
+        self.player_mock.location.items = []
+        self.assertRaisesWithMessage('There is nothing here', self.action.execute, player=self.player_mock)
+
+    def test__execute__raises_message_i_dont_see_any__when_place_is_not_player_location(self):
+        place_mock = self._get_place_mock()
+        place_mock.name = 'Library'
+        action = GetAllAction(place=place_mock)
+        self.assertRaisesWithMessage("I don't see any Library", action.execute, player=self.player_mock)
+
+
+class TestDropAllAction(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.player_mock = self._get_player_mock()
+        self.player_mock.has.return_value = True
+        self.widget = self._get_item_mock()
+        self.player_mock.inventory = self.player_mock.items = [self.widget]
+        self.action = DropAllAction()
+
+    def test__execute__drops_carried_items_in_single_batch(self):
+        self.assertEqual(
+            'Widget: The Widget is on the Klaatu Nebula floor',
+            str(self.action.execute(player=self.player_mock)),
+        )
+        self.player_mock.drop_items.assert_called_once_with([self.widget])
+
+    def test__execute__raises_result_for_each_item__when_no_item_can_be_dropped(self):
+        self.player_mock.has.return_value = False
+        self.assertRaisesWithMessage("Widget: You don't have it", self.action.execute, player=self.player_mock)
+        self.player_mock.drop_items.assert_not_called()
+
+    def test__execute__raises_message_not_carrying_anything__when_player_has_no_items(self):
+        self.player_mock.items = []
+        self.assertRaisesWithMessage('You are not carrying anything', self.action.execute, player=self.player_mock)
+
+
 class TestInventoryAction(GameTestCase):
 
     def setUp(self):
         super().setUp()
-        self.player_mock: Player = Mock()
+        self.player_mock: Player = self._get_player_mock()
         self.action = InventoryAction()
 
     def test__execute__returns_message_carrying_nothing__when_player_has_no_items(self):
@@ -164,3 +239,23 @@ class TestInventoryAction(GameTestCase):
         mock_item2.name = 'Beskar Steel'
         self.player_mock.inventory = [mock_item1, mock_item2]
         self.assertEqual('You are carrying: Flamethrower, Beskar Steel', str(self.action.execute(player=self.player_mock)))
+
+
+class TestGoAction(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+
+    def test__parse__returns_same_preallocated_action__for_shortcut_and_go_command(self):
+        other_game = Vampire()
+        action, _ = self.game.grammar.parse('e')
+        self.assertIs(action, self.game.grammar.parse('go east')[0])
+        self.assertIs(action, other_game.grammar.parse('go east')[0])
+
+    def test__execute__returns_description_of_destination__without_creating_look_action(self):
+        action, _ = self.game.grammar.parse('e')
+        with patch('game.text.actions.LookAction') as look_action_class:
+            result = action.execute(player=self.game.player)
+        look_action_class.assert_not_called()
+        self.assertEqual(self.game.places.lookup('Library').description, str(result))
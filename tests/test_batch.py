@@ -0,0 +1,49 @@
+import random
+import unittest
+
+from game.text.results import OutcomeStatus
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from game.text.batch import BatchSimulation
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestBatchSimulation(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.simulation = BatchSimulation(Vampire(), sessions=8)
+
+    def test__init__compiles_moves_gets_drops_and_looks__but_not_other_actions(self):
+        for command in ['east', 'look', 'inventory', 'get timepiece', 'drop timepiece', 'look sign', 'get all']:
+            self.assertIn(command, self.simulation.commands)
+        self.assertNotIn('hit crate', self.simulation.commands)
+        self.assertNotIn('undo', self.simulation.commands)
+
+    def test__step__moves_only_sessions_with_an_exit(self):
+        east, west = self.simulation.command_numbers['east'], self.simulation.command_numbers['west']
+        observation = self.simulation.step([east] * 4 + [west] * 4)
+        self.assertEqual([True] * 4 + [False] * 4, observation.succeeded.tolist())
+        self.assertEqual('Library', self.simulation.export_state(0)['location'])
+        self.assertEqual('Entrance Hall', self.simulation.export_state(7)['location'])
+
+    def test__step__matches_reference_engine__for_random_command_sequences(self):
+        randomizer = random.Random(1)
+        games = [Vampire() for _ in range(self.simulation.sessions)]
+        for _ in range(40):
+            commands = [randomizer.randrange(len(self.simulation.commands)) for _ in games]
+            observation = self.simulation.step(commands)
+            for session, (game, command) in enumerate(zip(games, commands)):
+                outcome = game.try_take_turn(self.simulation.commands[command])
+                self.assertEqual(outcome.status == OutcomeStatus.OK, observation.succeeded[session])
+                expected, state = game.export_state(), self.simulation.export_state(session)
+                self.assertEqual(expected['location'], state['location'])
+                for name, item_names in expected['items'].items():
+                    self.assertCountEqual(item_names, state['items'][name])
@@ -0,0 +1,43 @@
+from game.text.deltas import StateTracker
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestStateTracker(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+        self.tracker = StateTracker(self.game)
+
+    def test__delta__holds_whole_view__when_first_computed(self):
+        self.assertEqual(
+            {'place': 'Entrance Hall', 'items_added': ['Sign', 'Timepiece', 'Axe'], 'exits_added': ['East'],
+             'clock': 480},
+            self.tracker.delta().to_dict(),
+        )
+
+    def test__delta__is_empty__when_turn_changed_nothing(self):
+        self.tracker.delta()
+        self.game.take_turn('look')
+        self.assertTrue(self.tracker.delta().is_empty)
+
+    def test__delta__moves_item_from_place_to_inventory__when_player_gets_it(self):
+        self.tracker.delta()
+        self.game.take_turn('get timepiece')
+        self.assertEqual(
+            {'items_removed': ['Timepiece'], 'inventory_added': ['Timepiece']}, self.tracker.delta().to_dict()
+        )
+
+    def test__delta__lists_new_place_view__when_player_moves(self):
+        self.tracker.delta()
+        self.game.take_turn('e')
+        self.assertEqual(
+            {'place': 'Library', 'items_added': ['Crate', 'Brick Fireplace'], 'exits_added': ['West']},
+            self.tracker.delta().to_dict(),
+        )
+
+    def test__delta__reports_clock__when_time_changes(self):
+        self.tracker.delta()
+        self.game.time += 1
+        self.assertEqual({'clock': 481}, self.tracker.delta().to_dict())
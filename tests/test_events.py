@@ -0,0 +1,37 @@
+from game.text.text_games import TextGameMultiPlayer
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestEventBus(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = TextGameMultiPlayer(world=Vampire())
+        self.alice = self.game.join('Alice')
+        self.bob = self.game.join('Bob')
+        self.game.events.flush()
+
+    def test__flush__batches_messages_per_subscriber__for_players_in_same_place(self):
+        self.game.take_turn(self.alice, 'get timepiece')
+        self.game.take_turn(self.alice, 'drop timepiece')
+        self.assertEqual({self.bob: 'Alice takes the Timepiece\nAlice drops the Timepiece'}, self.game.events.flush())
+        self.assertEqual({}, self.game.events.flush())
+
+    def test__publish__skips_players_in_other_places(self):
+        self.game.take_turn(self.alice, 'e')
+        self.assertEqual({self.bob: 'Alice leaves'}, self.game.events.flush())
+        self.game.take_turn(self.bob, 'get timepiece')
+        self.assertEqual({}, self.game.events.flush())
+
+    def test__go__subscribes_player_to_destination(self):
+        self.game.take_turn(self.alice, 'e')
+        self.game.take_turn(self.bob, 'e')
+        self.assertEqual({self.bob: 'Alice leaves', self.alice: 'Bob arrives'}, self.game.events.flush())
+
+    def test__watch__delivers_events_to_spectator(self):
+        library = self.game.world.places.lookup('library')
+        self.game.watch(library, 'camera')
+        self.game.take_turn(self.alice, 'e')
+        self.game.take_turn(self.alice, 'get crate')
+        self.assertEqual('Alice arrives\nAlice takes the Crate', self.game.events.flush()['camera'])
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from game.control.executor import ShardedExecutor
+from game.text.results import OutcomeStatus
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestShardedExecutor(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.executor = ShardedExecutor(Vampire, workers=2)
+        self.addCleanup(self.executor.close)
+
+    def test__take_turn__keeps_state_of_each_session_on_its_worker(self):
+        self.executor.take_turn('a', 'get timepiece')
+        self.assertEqual(OutcomeStatus.OK, self.executor.take_turn('a', 'drop timepiece').status)
+        reply = self.executor.take_turn('b', 'drop timepiece')
+        self.assertEqual(("b", OutcomeStatus.ACTION_FAILED, "You don't have it"), tuple(reply))
+
+    def test__take_turns__returns_replies_in_command_order(self):
+        sessions = [f'session {number}' for number in range(10)]
+        replies = self.executor.take_turns([(session_id, 'e') for session_id in sessions] + [(sessions[0], 'w')])
+        self.assertEqual(sessions + [sessions[0]], [reply.session_id for reply in replies])
+        self.assertTrue(replies[-1].message.startswith('A dark and spooky entrance hall'))
+
+    def test__add_worker_and_remove_worker__move_sessions_with_their_state(self):
+        sessions = [f'session {number}' for number in range(20)]
+        self.executor.take_turns([(session_id, 'e') for session_id in sessions])
+        new_worker = self.executor.add_worker()
+        self.assertIn(new_worker, self.executor.owners.values())
+        self.executor.remove_worker(0)
+        self.assertNotIn(0, self.executor.owners.values())
+        for reply in self.executor.take_turns([(session_id, 'w') for session_id in sessions]):
+            self.assertEqual(OutcomeStatus.OK, reply.status)
+
+    def test__take_turn__resolves_owner_again__when_session_moves_before_dispatch(self):
+        self.executor.take_turn('a', 'e')
+        resolve = self.executor._worker_for
+
+        def resolve_then_move(session_id):
+            worker = resolve(session_id)
+            if len(self.executor.workers) > 1:
+                self.executor.remove_worker(worker.worker_id)
+            return worker
+
+        with patch.object(self.executor, '_worker_for', side_effect=resolve_then_move):
+            reply = self.executor.take_turn('a', 'w')
+        self.assertEqual(OutcomeStatus.OK, reply.status)
+
+    def test__take_turn_delta__replies_with_view_changes_and_leaves_out_place_description(self):
+        first = self.executor.take_turn_delta('a', 'get timepiece')
+        self.assertEqual('OK, you got the Timepiece', first.message)
+        self.assertEqual(['Timepiece'], first.delta['inventory_added'])
+        self.assertEqual(['Sign', 'Axe'], first.delta['items_added'])
+        reply = self.executor.take_turn_delta('a', 'e')
+        self.assertIsNone(reply.message)
+        self.assertEqual({'place': 'Library', 'items_added': ['Crate', 'Brick Fireplace'], 'exits_added': ['West']},
+                         reply.delta)
+        self.assertEqual(self.executor.take_turn('a', 'look').message, self.executor.describe('a'))
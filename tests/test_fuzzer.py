@@ -0,0 +1,44 @@
+import json
+import tempfile
+
+from game.text.fuzzer import Fuzzer
+from game.text.things import Action
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestFuzzer(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+
+        def boom(player):
+            if player.inventory:
+                raise RuntimeError('boom while carrying')
+            return 'nothing happens'
+
+        self.game.grammar.raw_actions_by_verb.add_thing(Action(boom))
+
+    def test__fuzz__returns_minimized_crash__when_command_sequence_raises(self):
+        crashes = Fuzzer(self.game, seed=7, sequence_length=30).fuzz(200)
+        self.assertEqual(1, len(crashes))
+        self.assertEqual('RuntimeError', crashes[0].error_type)
+        self.assertEqual(2, len(crashes[0].commands))
+        self.assertEqual('boom', crashes[0].commands[-1])
+
+    def test__fuzz__is_reproducible__with_same_seed(self):
+        first = Fuzzer(self.game, seed=3).fuzz(50)
+        second = Fuzzer(self.game, seed=3).fuzz(50)
+        self.assertEqual([crash.commands for crash in first], [crash.commands for crash in second])
+
+    def test__fuzz__returns_no_crashes__when_game_handles_every_command(self):
+        self.assertEqual([], Fuzzer(Vampire(), seed=1).fuzz(50))
+
+    def test__write_report__writes_commands_and_traceback(self):
+        crash = Fuzzer(self.game, seed=7, sequence_length=30).fuzz(200)[0]
+        with tempfile.TemporaryDirectory() as directory:
+            with open(Fuzzer.write_report(crash, directory), encoding='utf-8') as report_file:
+                report = json.load(report_file)
+        self.assertEqual(crash.commands, report['commands'])
+        self.assertIn('boom while carrying', report['traceback'])
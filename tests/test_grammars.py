@@ -0,0 +1,44 @@
+from game.text.grammars import ScannedPhrase, SimplePhrase
+from game.text.results import OutcomeStatus
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestScannedPhrase(GameTestCase):
+
+    def test__init__finds_lowercased_verb_and_object(self):
+        phrase = ScannedPhrase('  GET   Crate ')
+        self.assertEqual(('get', 'crate'), (phrase.verb, phrase.object))
+
+    def test__init__skips_noise_words(self):
+        phrase = ScannedPhrase('look at the sign')
+        self.assertEqual(('look', 'sign'), (phrase.verb, phrase.object))
+
+    def test__init__has_no_object__when_only_noise_words_follow_verb(self):
+        phrase = ScannedPhrase('look at')
+        self.assertEqual(('look', None), (phrase.verb, phrase.object))
+
+    def test__init__has_empty_verb__when_input_is_blank(self):
+        phrase = ScannedPhrase('   ')
+        self.assertEqual(('', None), (phrase.verb, phrase.object))
+
+    def test__init__is_bulk__when_all_follows_verb_and_precedes_object(self):
+        self.assertTrue(ScannedPhrase('get all from library').is_bulk)
+        self.assertFalse(ScannedPhrase('get all').is_bulk)
+        self.assertFalse(ScannedPhrase('get library').is_bulk)
+
+    def test__init__matches_simple_phrase__when_input_has_no_noise_words(self):
+        for text_input in ['e', 'get crate', 'hit brick fireplace', 'go east now']:
+            simple, scanned = SimplePhrase(text_input), ScannedPhrase(text_input)
+            self.assertEqual((simple.verb, simple.object), (scanned.verb, scanned.object))
+
+
+class TestSimpleGrammar(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.grammar = Vampire().grammar
+
+    def test__try_parse__returns_no_input_outcome__when_input_is_blank(self):
+        for text_input in ['', '   ']:
+            self.assertEqual(OutcomeStatus.NO_INPUT, self.grammar.try_parse(text_input).status)
@@ -0,0 +1,69 @@
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestCommandHistory(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+        self.history = self.game.history
+        self.timepiece = self.game.player.location.items.lookup('timepiece')
+
+    def test__undo__returns_item_to_location__when_last_command_got_it(self):
+        self.game.take_turn('get timepiece')
+        self.assertEqual('OK, undid "get timepiece"', str(self.game.take_turn('undo')))
+        self.assertFalse(self.game.player.has(self.timepiece))
+        self.assertTrue(self.game.player.location.has(self.timepiece))
+
+    def test__redo__executes_undone_command_again(self):
+        self.game.take_turn('get timepiece')
+        self.game.take_turn('undo')
+        self.assertEqual('OK, redid "get timepiece"', str(self.game.take_turn('redo')))
+        self.assertTrue(self.game.player.has(self.timepiece))
+
+    def test__undo__raises_message_nothing_to_undo__when_no_commands_executed(self):
+        self.assertRaisesWithMessage('There is nothing to undo', self.game.take_turn, 'undo')
+
+    def test__record__discards_redoable_commands__when_new_command_is_executed(self):
+        self.game.take_turn('get timepiece')
+        self.game.take_turn('undo')
+        self.game.take_turn('e')
+        self.assertFalse(self.history.can_redo)
+        self.assertEqual(['e'], self.history.commands)
+
+    def test__record__does_not_record_failed_commands(self):
+        self.game.try_take_turn('get foo')
+        self.game.try_take_turn('n')
+        self.assertEqual([], self.history.commands)
+
+    def test__rewind_to__restores_state_from_nearest_checkpoint(self):
+        self.history.checkpoint_interval = 2
+        for text_input in ['get timepiece', 'e', 'drop timepiece', 'w', 'look']:
+            self.game.take_turn(text_input)
+        self.assertEqual([0, 2, 4], sorted(self.history.checkpoints))
+        self.history.rewind_to(3)
+        self.assertEqual('Library', self.game.player.location.name)
+        self.assertTrue(self.game.player.location.has(self.timepiece))
+        self.history.rewind_to(1)
+        self.assertEqual('Entrance Hall', self.game.player.location.name)
+        self.assertTrue(self.game.player.has(self.timepiece))
+
+    def test__record__drops_oldest_commands_and_checkpoints__when_log_exceeds_max_commands(self):
+        self.history.checkpoint_interval = 2
+        self.history.max_commands = 3
+        for text_input in ['get timepiece', 'e', 'drop timepiece', 'w', 'e', 'get timepiece']:
+            self.game.take_turn(text_input)
+        self.assertEqual(['drop timepiece', 'w', 'e', 'get timepiece'], self.history.commands)
+        self.assertEqual([0, 2, 4], sorted(self.history.checkpoints))
+        self.history.rewind_to(0)
+        self.assertEqual('Library', self.game.player.location.name)
+        self.assertTrue(self.game.player.has(self.timepiece))
+
+    def test__undo__restores_turns_and_end_of_game__when_last_command_ended_it(self):
+        self.game.take_turn('get timepiece')
+        self.game.end_turn()
+        self.game.end(is_won=False)
+        self.game.take_turn('undo')
+        self.assertFalse(self.game.is_ended)
+        self.assertEqual(0, self.game.turns)
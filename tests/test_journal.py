@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+
+from game.text.journal import Journal
+from game.text.rules import Event
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestJournal(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'sessions.journal')
+        self.journal = Journal(self.path, batch_size=3)
+        self.addCleanup(self.journal.close)
+
+    def _start_session(self, session_id) -> Vampire:
+        game = Vampire()
+        game.attach_journal(self.journal, session_id)
+        return game
+
+    def test__take_turn__appends_only_accepted_commands(self):
+        game = self._start_session('a')
+        game.try_take_turn('get timepiece')
+        game.try_take_turn('get foo')
+        game.try_take_turn('e')
+        self.assertEqual({'a': (None, ['get timepiece', 'e'])}, self.journal.read())
+
+    def test__append__commits_pending_records_in_batches(self):
+        first, second = self._start_session('a'), self._start_session('b')
+        first.take_turn('look')
+        second.take_turn('look')
+        self.assertEqual(2, self.journal.pending)
+        first.take_turn('e')
+        self.assertEqual(0, self.journal.pending)
+
+    def test__append__commits_pending_records__when_max_delay_passes(self):
+        journal = Journal(self.path, batch_size=100, max_delay=0.01)
+        self.addCleanup(journal.close)
+        journal.append('a', 'look')
+        deadline = time.monotonic() + 5
+        while journal.pending > 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(0, journal.pending)
+
+    def test__recover__replays_commands_of_each_session(self):
+        first, second = self._start_session('a'), self._start_session('b')
+        first.take_turn('get timepiece')
+        first.take_turn('e')
+        second.take_turn('e')
+        self.journal.close()
+        recovered = Journal(self.path).recover(Vampire)
+        self.assertEqual(first.export_state(), recovered['a'].export_state())
+        self.assertEqual(second.export_state(), recovered['b'].export_state())
+        self.assertIs(recovered['a'].journal, recovered['b'].journal)
+
+    def test__compact__replaces_commands_with_snapshot_of_each_session(self):
+        game = self._start_session('a')
+        game.take_turn('get timepiece')
+        game.take_turn('e')
+        game.time += 5
+        self.journal.compact({'a': game})
+        game.take_turn('drop timepiece')
+        state, commands = self.journal.read()['a']
+        self.assertEqual('Library', state['location'])
+        self.assertEqual(['drop timepiece'], commands)
+        recovered = self.journal.recover(Vampire)['a']
+        self.assertEqual(game.export_state(), recovered.export_state())
+
+    def test__recover__recreates_items_spawned_while_playing(self):
+        game = self._start_session('a')
+        library = game.places.lookup('Library')
+        game.break_open(Event('hit', library.items.lookup('Crate'), library, game.player))
+        self.journal.compact({'a': game})
+        recovered = self.journal.recover(Vampire)['a']
+        self.assertEqual(game.export_state(), recovered.export_state())
+        self.assertTrue(recovered.has_item('Wooden Stakes'))
@@ -0,0 +1,27 @@
+from game.control.load import LoadGenerator, percentile
+from tests import GameTestCase
+
+
+class TestLoadGenerator(GameTestCase):
+
+    def test__percentile__returns_nearest_rank_value_of_sorted_values(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(50.0, percentile(values, 0.50))
+        self.assertEqual(99.0, percentile(values, 0.99))
+        self.assertEqual(1.0, percentile([1.0, 2.0], 0.0))
+        self.assertEqual(0.0, percentile([], 0.99))
+
+    def test__run__reports_each_interval_and_total(self):
+        generator = LoadGenerator(players=5, seed=1)
+        reports = generator.run(seconds=0.2, interval=0.05)
+        self.assertGreaterEqual(len(reports), 2)
+        self.assertEqual(sum(report.turns for report in reports), generator.total.turns)
+        self.assertTrue(all(report.p50 <= report.p99 for report in reports))
+
+    def test__run__drives_commands_through_console__when_target_is_console(self):
+        generator = LoadGenerator(players=2, target='console')
+        generator.run(seconds=0.05)
+        self.assertGreater(generator.total.turns, 0)
+
+    def test__init__raises_error__when_target_is_unknown(self):
+        self.assertRaises(ValueError, LoadGenerator, players=1, target='carrier pigeon')
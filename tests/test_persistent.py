@@ -0,0 +1,85 @@
+import random
+
+from game.text.persistent import PersistentDict, PersistentMap, PersistentSequence
+from tests import GameTestCase
+
+
+class CollidingKey:
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return len(self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.name == self.name
+
+
+class TestPersistentMap(GameTestCase):
+
+    def test__set__returns_new_version_and_keeps_old_version_unchanged(self):
+        first = PersistentMap({'a': 1})
+        second = first.set('b', 2)
+        self.assertEqual({'a': 1}, dict(first))
+        self.assertEqual({'a': 1, 'b': 2}, dict(second))
+
+    def test__delete__raises_key_error__when_key_is_missing(self):
+        self.assertRaises(KeyError, PersistentMap({'a': 1}).delete, 'b')
+
+    def test__set_and_delete__match_dict__for_random_operations(self):
+        generator = random.Random(42)
+        keys = [f'key{number}' for number in range(300)] + [CollidingKey(name) for name in ('ab', 'cd', 'ef', 'xyz')]
+        persistent_map, expected, versions = PersistentMap(), {}, []
+        for _ in range(5000):
+            key = generator.choice(keys)
+            if key in expected and generator.random() < 0.4:
+                persistent_map = persistent_map.delete(key)
+                del expected[key]
+            else:
+                value = generator.randint(0, 9)
+                persistent_map = persistent_map.set(key, value)
+                expected[key] = value
+            if generator.random() < 0.01:
+                versions.append((persistent_map, dict(expected)))
+        self.assertEqual(expected, dict(persistent_map))
+        self.assertEqual(len(expected), len(persistent_map))
+        for version, contents in versions:
+            self.assertEqual(contents, dict(version))
+
+
+class TestPersistentDict(GameTestCase):
+
+    def test__restore__returns_to_snapshot(self):
+        persistent_dict = PersistentDict(a=1)
+        snapshot = persistent_dict.snapshot()
+        persistent_dict['b'] = 2
+        del persistent_dict['a']
+        persistent_dict.restore(snapshot)
+        self.assertEqual({'a': 1}, dict(persistent_dict))
+
+
+class TestPersistentSequence(GameTestCase):
+
+    def test__iter__yields_values_in_position_order__for_random_appends_and_deletes(self):
+        generator = random.Random(42)
+        sequence, expected, versions = PersistentSequence(capacity=2000), {}, []
+        for _ in range(1500):
+            if expected and generator.random() < 0.4:
+                position = generator.choice(list(expected))
+                sequence = sequence.delete(position)
+                del expected[position]
+            else:
+                expected[sequence.end] = generator.randint(0, 9)
+                sequence = sequence.append(expected[sequence.end])
+            if generator.random() < 0.01:
+                versions.append((sequence, list(expected.values())))
+        self.assertEqual(list(expected.values()), list(sequence))
+        self.assertEqual(len(expected), len(sequence))
+        for version, contents in versions:
+            self.assertEqual(contents, list(version))
+
+    def test__append__raises_index_error__when_sequence_is_full(self):
+        sequence = PersistentSequence(range(32))
+        self.assertEqual(32, sequence.capacity)
+        self.assertRaises(IndexError, sequence.append, 32)
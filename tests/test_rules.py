@@ -0,0 +1,74 @@
+from unittest.mock import Mock
+
+from game.text.rules import Event, Rule, RuleEngine
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestRuleEngine(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.engine = RuleEngine()
+        self.item, self.place = self._get_item_mock(), self._get_place_mock()
+
+    def test__rules_for__returns_only_rules_indexed_under_event__when_engine_has_many_rules(self):
+        for _ in range(1000):
+            self.engine.add(Rule('get', Mock(), item=self._get_item_mock(), place=self.place))
+        rule = self.engine.add(Rule('get', Mock(), item=self.item, place=self.place))
+        self.assertEqual([rule], self.engine.rules_for(Event('get', self.item, self.place, None)))
+
+    def test__rules_for__includes_wildcard_rules_in_order_added(self):
+        anywhere = self.engine.add(Rule('get', Mock()))
+        exact = self.engine.add(Rule('get', Mock(), item=self.item, place=self.place))
+        in_place = self.engine.add(Rule('get', Mock(), place=self.place))
+        self.engine.add(Rule('drop', Mock()))
+        self.assertEqual([anywhere, exact, in_place], self.engine.rules_for(Event('get', self.item, self.place, None)))
+
+    def test__fire__applies_effect_only__when_condition_holds(self):
+        effect = Mock(return_value='Boom')
+        self.engine.add(Rule('get', effect, condition=lambda event: event.place is self.place))
+        self.assertEqual([], self.engine.fire(Event('get', self.item, self._get_place_mock(), None)))
+        self.assertEqual(['Boom'], self.engine.fire(Event('get', self.item, self.place, None)))
+        effect.assert_called_once()
+
+    def test__remove__stops_rule_from_firing(self):
+        rule = self.engine.add(Rule('get', Mock()))
+        self.engine.remove(rule)
+        self.assertEqual(0, len(self.engine))
+        self.assertEqual([], self.engine.fire(Event('get', self.item, self.place, None)))
+
+
+class TestVampireRules(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+
+    def test__take_turn__fires_arrive_rule__when_player_enters_place(self):
+        library = self.game.places.lookup('Library')
+        self.game.rules.add(Rule('arrive', lambda event: 'A draught chills you', place=library))
+        self.assertTrue(str(self.game.take_turn('e')).endswith('A draught chills you'))
+        self.assertNotIn('A draught chills you', str(self.game.take_turn('look')))
+
+    def test__take_turn__breaks_crate_open__when_player_hits_it_carrying_axe(self):
+        self.game.take_turn('get axe')
+        self.game.take_turn('e')
+        result = str(self.game.take_turn('hit crate'))
+        self.assertTrue(result.startswith('You hit the Crate with the Axe\nThe Crate breaks open!\n'), result)
+        library = self.game.places.lookup('Library')
+        self.assertEqual(['Brick Fireplace', 'Wooden Stakes'], [item.name for item in library.inventory])
+        self.assertEqual('OK, you got the Wooden Stakes', str(self.game.take_turn('get stakes')))
+
+    def test__import_state__restores_item__when_it_was_broken_open_since(self):
+        state = self.game.export_state()
+        for command in ['get axe', 'e', 'hit crate']:
+            self.game.take_turn(command)
+        self.game.import_state(state)
+        library = self.game.places.lookup('Library')
+        self.assertEqual(['Crate', 'Brick Fireplace'], [item.name for item in library.inventory])
+
+    def test__take_turn__leaves_crate__when_player_has_no_axe(self):
+        self.game.take_turn('e')
+        self.assertEqual('      -- With what? ', str(self.game.take_turn('hit crate')))
+        self.assertFalse(self.game.has_item('Wooden Stakes'))
@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+from game.control.sessions import SessionStore
+from game.text.journal import Journal
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestSessionStore(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.store = SessionStore(Vampire, max_sessions=2)
+        self.addCleanup(self.store.close)
+
+    def test__get__hibernates_least_recently_used_session__when_over_budget(self):
+        self.store.try_take_turn('a', 'get timepiece')
+        self.store.try_take_turn('b', 'e')
+        self.store.try_take_turn('a', 'look')
+        self.store.try_take_turn('c', 'look')
+        self.assertNotIn('b', self.store)
+        self.assertIn('a', self.store)
+        self.assertEqual(1, self.store.stats.hibernations)
+
+    def test__get__rehydrates_hibernated_session_with_its_state(self):
+        self.store.try_take_turn('a', 'get timepiece; e')
+        self.store.try_take_turn('a', 'define back = w')
+        self.store.try_take_turn('b', 'look')
+        self.store.try_take_turn('c', 'look')
+        outcome = self.store.try_take_turn('a', 'back')
+        self.assertTrue(outcome.is_success)
+        game = self.store.get('a')
+        self.assertEqual('Entrance Hall', game.player.location.name)
+        self.assertEqual(['Timepiece'], [item.name for item in game.player.inventory])
+        self.assertEqual(1, self.store.stats.rehydrations)
+
+    def test__get__attaches_journal_to_rehydrated_session(self):
+        with tempfile.TemporaryDirectory() as directory:
+            journal = Journal(os.path.join(directory, 'sessions.journal'))
+            store = SessionStore(Vampire, max_sessions=1, journal=journal)
+            store.try_take_turn('a', 'get timepiece')
+            store.try_take_turn('b', 'look')
+            store.try_take_turn('a', 'e')
+            store.close()
+            self.assertEqual((None, ['get timepiece', 'e']), journal.read()['a'])
+            journal.close()
+
+    def test__init__raises_value_error__when_max_sessions_is_less_than_one(self):
+        self.assertRaises(ValueError, SessionStore, Vampire, max_sessions=0)
+
+    def test__stats__reports_hit_rate(self):
+        self.store.get('a')
+        self.store.get('a')
+        self.store.get('a')
+        self.store.get('b')
+        self.assertEqual(0.5, self.store.stats.hit_rate)
+
+    def test__close__hibernates_sessions_to_file_for_next_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sessions.sqlite')
+            store = SessionStore(Vampire, path=path)
+            store.try_take_turn('a', 'e')
+            store.close()
+            store = SessionStore(Vampire, path=path)
+            self.assertEqual('Library', store.get('a').player.location.name)
+            store.close()
@@ -0,0 +1,29 @@
+from game.text.solver import Solver, SolverLimitReachedError
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestSolver(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+        self.library = self.game.places.lookup('library')
+        self.timepiece = self.game.player.location.items.lookup('timepiece')
+
+    def test__solve__returns_shortest_command_sequence_reaching_goal(self):
+        solver = Solver(self.game, is_goal=lambda game: self.library.has(self.timepiece))
+        self.assertEqual(['get timepiece', 'east', 'drop timepiece'], solver.solve())
+
+    def test__solve__returns_none_and_explores_every_state__when_goal_is_unreachable(self):
+        solver = Solver(self.game)
+        self.assertIsNone(solver.solve())
+        self.assertGreater(solver.states_explored, 1)
+
+    def test__solve__leaves_game_in_starting_state(self):
+        state = self.game.export_state()
+        Solver(self.game, is_goal=lambda game: self.library.has(self.timepiece)).solve()
+        self.assertEqual(state, self.game.export_state())
+
+    def test__solve__raises_error__when_reachable_states_exceed_limit(self):
+        self.assertRaises(SolverLimitReachedError, Solver(self.game, max_states=2).solve)
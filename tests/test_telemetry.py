@@ -0,0 +1,115 @@
+import mmap
+import os
+import tempfile
+import unittest
+from array import array
+from unittest.mock import patch
+
+from game.text.results import OutcomeStatus
+from game.text.telemetry import TelemetryLog, read_chunks
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from game.text.telemetry_reader import TelemetryReader
+
+
+class TelemetryTestCase(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'commands.telemetry')
+        self.log = TelemetryLog(self.path, chunk_rows=3)
+
+    def _play(self, session_id, commands):
+        game = Vampire()
+        game.attach_telemetry(self.log, session_id)
+        for command in commands:
+            game.try_take_turn(command)
+
+
+class TestTelemetryLog(TelemetryTestCase):
+
+    def test__record__flushes_chunk__when_chunk_is_full(self):
+        self._play('a', ['look', 'e', 'xyzzy', 'w'])
+        self.assertEqual([3], [rows for rows, _, _ in read_chunks(self.path)])
+        self.assertEqual(1, len(self.log))
+
+    def test__flush__writes_only_new_names_in_each_chunk(self):
+        self._play('a', ['look', 'e', 'look', 'get crate'])
+        self.log.close()
+        new_names = [names for _, names, _ in read_chunks(self.path)]
+        self.assertEqual({'session': ['a'], 'verb': ['look', 'e'], 'object': ['']}, new_names[0])
+        self.assertEqual({'session': [], 'verb': ['get'], 'object': ['crate']}, new_names[1])
+
+    def test__read_chunks__ignores_chunk_cut_short(self):
+        self._play('a', ['look', 'e', 'w', 'look'])
+        self.log.close()
+        with open(self.path, 'r+b') as log_file:
+            log_file.truncate(os.path.getsize(self.path) - 1)
+        self.assertEqual([3], [rows for rows, _, _ in read_chunks(self.path)])
+
+    def test__read_chunks__closes_map__when_log_is_read(self):
+        self._play('a', ['look', 'e', 'w'])
+        maps, mmap_type = [], mmap.mmap
+
+        def open_map(*args, **kwargs):
+            maps.append(mmap_type(*args, **kwargs))
+            return maps[-1]
+
+        with patch('game.text.telemetry.mmap.mmap', side_effect=open_map):
+            self.assertEqual([3], [rows for rows, _, _ in read_chunks(self.path)])
+        self.assertTrue(maps[0].closed)
+
+    def test__init__continues_names_and_turns__when_log_exists(self):
+        self._play('a', ['look', 'e', 'w', 'look'])
+        self.log.close()
+        with open(self.path, 'ab') as log_file:
+            log_file.write(TelemetryLog.HEADER.pack(TelemetryLog.MAGIC, 3, 0))
+        self.log = TelemetryLog(self.path, chunk_rows=3)
+        self._play('a', ['look', 'get crate'])
+        self.log.close()
+        chunks = [(rows, new_names, bytes(columns['turn'])) for rows, new_names, columns in read_chunks(self.path)]
+        self.assertEqual([3, 1, 2], [rows for rows, _, _ in chunks])
+        self.assertEqual({'session': [], 'verb': ['get'], 'object': ['crate']}, chunks[2][1])
+        self.assertEqual([5, 6], list(array('I', chunks[2][2])))
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestTelemetryReader(TelemetryTestCase):
+
+    def test__count_by__counts_rows_of_every_session_across_chunks(self):
+        self._play('a', ['look', 'e', 'w', 'look'])
+        self._play('b', ['e', 'get crate'])
+        self.log.close()
+        reader = TelemetryReader([self.path])
+        self.assertEqual({'a': 4, 'b': 2}, reader.count_by('session'))
+        self.assertEqual({'look': 2, 'e': 2, 'w': 1, 'get': 1}, reader.count_by('verb'))
+
+    def test__failure_rate_by__returns_fraction_of_failed_commands_per_verb(self):
+        self._play('a', ['get timepiece', 'get foo', 'xyzzy', 'get sign'])
+        self.log.close()
+        reader = TelemetryReader([self.path])
+        self.assertEqual({'get': 2 / 3, 'xyzzy': 1.0}, reader.failure_rate_by('verb'))
+        self.assertEqual(
+            {'UNKNOWN_THING': 1, 'UNKNOWN_ACTION': 1, 'ACTION_FAILED': 1},
+            reader.count_by('outcome', [status for status in OutcomeStatus if status != OutcomeStatus.OK]),
+        )
+
+    def test__mean_latency_by__merges_names_of_many_logs(self):
+        self._play('a', ['look', 'e'])
+        self.log.close()
+        other_path = f'{self.path}.2'
+        self.log = TelemetryLog(other_path)
+        self._play('b', ['look'])
+        self.log.close()
+        latencies = TelemetryReader([self.path, other_path]).mean_latency_by('verb')
+        self.assertEqual({'look', 'e'}, set(latencies))
+        self.assertTrue(all(latency >= 0 for latency in latencies.values()))
@@ -0,0 +1,199 @@
+import gc
+import threading
+import weakref
+from unittest.mock import Mock, patch
+
+from game.text.actions import GetActionItemIsFixedInPlace, GoActionItemNoConnectionToDestination
+from game.text.results import OutcomeStatus
+from game.text.text_games import (
+    GamePlayerNotInGameError, GameUnknownActionError, GameUnknownObjectError, TextGameMultiPlayer,
+)
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestTryTakeTurn(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+
+    def test__try_take_turn__returns_ok_outcome_with_result__when_command_succeeds(self):
+        outcome = self.game.try_take_turn('get timepiece')
+        self.assertEqual(OutcomeStatus.OK, outcome.status)
+        self.assertEqual('get', outcome.action.name)
+        self.assertEqual('Timepiece', outcome.thing.name)
+        self.assertEqual('OK, you got the Timepiece', outcome.message)
+
+    def test__try_take_turn__returns_unknown_thing_outcome__when_object_is_unknown(self):
+        outcome = self.game.try_take_turn('get foo')
+        self.assertEqual(OutcomeStatus.UNKNOWN_THING, outcome.status)
+        self.assertEqual("I don't know that word.", outcome.message)
+
+    def test__try_take_turn__returns_unknown_action_outcome__when_verb_is_unknown(self):
+        outcome = self.game.try_take_turn('xyzzy')
+        self.assertEqual(OutcomeStatus.UNKNOWN_ACTION, outcome.status)
+        self.assertEqual("I don't know how to do that.", outcome.message)
+
+    def test__try_take_turn__returns_action_failed_outcome__when_item_is_fixed(self):
+        outcome = self.game.try_take_turn('get sign')
+        self.assertEqual(OutcomeStatus.ACTION_FAILED, outcome.status)
+        self.assertEqual("You can't get it", outcome.message)
+
+    def test__try_take_turn__returns_action_failed_outcome__when_there_is_no_exit(self):
+        outcome = self.game.try_take_turn('go north')
+        self.assertEqual(OutcomeStatus.ACTION_FAILED, outcome.status)
+        self.assertIsInstance(outcome.error, GoActionItemNoConnectionToDestination)
+
+    def test__try_take_turn__returns_refusal_instead_of_error__when_command_fails(self):
+        outcome = self.game.try_take_turn('get sign')
+        self.assertIs(GetActionItemIsFixedInPlace, outcome.refusal.error_type)
+        self.assertEqual('Sign', outcome.refusal.thing.name)
+
+    def test__try_take_turn__returns_action_failed_outcome__when_strategy_raises_action_error(self):
+        timepiece = self.game.player.location.items.lookup('timepiece')
+        timepiece.find_action('get').strategy = Mock(side_effect=GetActionItemIsFixedInPlace(timepiece))
+        outcome = self.game.try_take_turn('get timepiece')
+        self.assertEqual(OutcomeStatus.ACTION_FAILED, outcome.status)
+        self.assertIs(GetActionItemIsFixedInPlace, outcome.refusal.error_type)
+        self.assertEqual("You can't get it", outcome.message)
+        self.assertFalse(self.game.history.can_undo)
+
+    def test__try_take_turn__gets_all_items_of_place__only_when_command_says_all(self):
+        self.game.take_turn('e')
+        self.assertEqual(OutcomeStatus.UNKNOWN_ACTION_FOR_THING, self.game.try_take_turn('get library').status)
+        outcome = self.game.try_take_turn('get all from library')
+        self.assertEqual(OutcomeStatus.OK, outcome.status)
+        self.assertEqual('Crate: OK, you got the Crate\nBrick Fireplace: You can\'t get it', outcome.message)
+
+    def test__try_take_turn__returns_action_failed_outcome__when_no_item_can_be_gotten(self):
+        self.game.take_turn('e')
+        self.game.take_turn('get crate')
+        outcome = self.game.try_take_turn('get all')
+        self.assertEqual(OutcomeStatus.ACTION_FAILED, outcome.status)
+        self.assertEqual("Brick Fireplace: You can't get it", outcome.message)
+        self.assertEqual(2, self.game.history.position)
+
+    def test__try_take_turn__counts_actions_per_player__when_games_share_direction_actions(self):
+        other = Vampire()
+        self.game.try_take_turn('e')
+        self.game.try_take_turn('w')
+        other.try_take_turn('e')
+        other.dry_run('w')
+        self.assertEqual({'east': 1, 'west': 1}, self.game.player.action_counts)
+        self.assertEqual({'east': 1}, other.player.action_counts)
+
+    def test__take_turn__raises_game_error__when_command_fails(self):
+        self.assertRaises(GameUnknownObjectError, self.game.take_turn, 'get foo')
+        self.assertRaises(GameUnknownActionError, self.game.take_turn, 'xyzzy')
+        self.assertRaisesWithMessage("You can't get it", self.game.take_turn, 'get sign')
+
+
+class TestTextGameMultiPlayer(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = TextGameMultiPlayer(world=Vampire())
+        self.alice = self.game.join('Alice')
+        self.bob = self.game.join('Bob')
+
+    def test__try_take_turn__returns_refusal__when_player_has_left(self):
+        self.game.leave(self.bob)
+        outcome = self.game.try_take_turn(self.bob, 'get timepiece')
+        self.assertEqual(OutcomeStatus.ACTION_FAILED, outcome.status)
+        self.assertIs(GamePlayerNotInGameError, outcome.refusal.error_type)
+        hall = self.alice.location
+        self.assertTrue(hall.has(hall.items.lookup('timepiece')))
+
+    def test__leave__holds_lock_of_player_location(self):
+        hall = self.bob.location
+        with patch.object(self.game, 'lock_places', wraps=self.game.lock_places) as lock_places:
+            self.game.leave(self.bob)
+        lock_places.assert_called_once_with([hall])
+        self.assertNotIn('Bob', self.game.players_by_name)
+
+    def test__take_turn__shares_world_between_players(self):
+        self.game.take_turn(self.alice, 'get timepiece')
+        self.assertRaisesWithMessage("I don't see any Timepiece", self.game.take_turn, self.bob, 'get timepiece')
+        self.game.take_turn(self.alice, 'e')
+        self.game.take_turn(self.alice, 'drop timepiece')
+        self.game.take_turn(self.bob, 'e')
+        self.assertEqual('OK, you got the Timepiece', str(self.game.take_turn(self.bob, 'get timepiece')))
+
+    def test__take_turn__moves_only_the_player_issuing_the_command(self):
+        self.game.take_turn(self.alice, 'e')
+        self.assertEqual('Library', self.alice.location.name)
+        self.assertEqual('Entrance Hall', self.bob.location.name)
+
+    def test__take_turn__keeps_items_consistent__when_players_race_for_the_same_item(self):
+        players = [self.game.join(f'Player {number}') for number in range(8)]
+
+        def play(player):
+            for _ in range(200):
+                self.game.try_take_turn(player, 'get timepiece')
+                self.game.try_take_turn(player, 'drop timepiece')
+
+        threads = [threading.Thread(target=play, args=(player,)) for player in players]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        hall = self.alice.location
+        self.assertEqual(['Axe', 'Sign', 'Timepiece'], sorted(item.name for item in hall.inventory))
+        self.assertFalse(any(player.items for player in players))
+
+
+class TestCommandChains(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+
+    def test__try_take_turn__executes_every_command_of_line_and_combines_results(self):
+        outcome = self.game.try_take_turn('get timepiece; e ;drop timepiece')
+        self.assertEqual(OutcomeStatus.OK, outcome.status)
+        self.assertEqual(3, len(outcome.outcomes))
+        self.assertEqual('The Timepiece is on the Library floor', outcome.message.splitlines()[-1])
+        self.assertEqual(['get timepiece', 'e', 'drop timepiece'], self.game.history.commands)
+
+    def test__try_take_turn__stops_at_first_failing_command(self):
+        outcome = self.game.try_take_turn('get timepiece; n; e')
+        self.assertEqual(OutcomeStatus.ACTION_FAILED, outcome.status)
+        self.assertEqual("OK, you got the Timepiece\nYou can't go there", outcome.message)
+        self.assertEqual('Entrance Hall', self.game.player.location.name)
+        self.assertEqual(['get timepiece'], self.game.history.commands)
+
+    def test__try_take_turn__expands_macros(self):
+        self.assertEqual('OK, "fetch" now means "e; get crate; w"', str(self.game.take_turn('define fetch = e; get crate; w')))
+        self.game.take_turn('define shuttle = fetch; drop crate')
+        outcome = self.game.try_take_turn('shuttle')
+        self.assertEqual(OutcomeStatus.OK, outcome.status)
+        self.assertIn('Crate', [item.name for item in self.game.player.location.inventory])
+
+    def test__try_take_turn__ignores_recursive_macro_use(self):
+        self.game.take_turn('define spin = look; spin')
+        self.assertEqual(OutcomeStatus.UNKNOWN_ACTION, self.game.try_take_turn('spin').status)
+
+    def test__try_take_turn__raises_message_how_to_define__when_macro_definition_is_malformed(self):
+        self.assertRaisesWithMessage(
+            'To define a macro, type: define name = command; command', self.game.take_turn, 'define fetch'
+        )
+
+
+class TestClose(GameTestCase):
+
+    def test__close__lets_game_be_freed_without_cyclic_garbage_collector(self):
+        game = Vampire()
+        for text_input in ['get timepiece', 'e', 'hit crate', 'get foo', 'w', 'undo', 'drop all', 'go north']:
+            game.try_take_turn(text_input)
+        game.dry_run('e')
+        reference = weakref.ref(game)
+        gc.disable()
+        self.addCleanup(gc.enable)
+        game.close()
+        del game
+        self.assertIsNone(reference())
+
+    def test__game__raises_reference_error__when_thing_outlives_its_game(self):
+        timepiece = Vampire().player.location.items.lookup('timepiece')
+        self.assertRaises(ReferenceError, lambda: timepiece.description)
@@ -0,0 +1,100 @@
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestPlayerScope(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+        self.player = self.game.player
+        self.timepiece = self.player.location.items.lookup('timepiece')
+
+    def test__scope__is_shared__when_nothing_has_changed(self):
+        scope = self.player.scope
+        self.game.take_turn('look')
+        self.assertIs(scope, self.player.scope)
+
+    def test__scope__is_recomputed__when_player_gets_item(self):
+        scope = self.player.scope
+        self.game.take_turn('get timepiece')
+        self.assertIsNot(scope, self.player.scope)
+        self.assertTrue(self.player.scope.carries(self.timepiece))
+        self.assertFalse(self.player.scope.sees(self.timepiece))
+
+    def test__scope__is_recomputed__when_player_moves(self):
+        self.player.scope
+        self.game.take_turn('e')
+        self.assertEqual('Library', self.player.scope.location.name)
+        self.assertEqual(['West'], [direction.name for direction in self.player.scope.exits])
+
+    def test__scope__is_recomputed__when_location_changes_outside_player(self):
+        self.player.scope
+        self.player.location.remove_item(self.timepiece)
+        self.assertFalse(self.player.scope.sees(self.timepiece))
+
+    def test__inventory__returns_copy__when_caller_changes_it(self):
+        self.game.take_turn('get timepiece')
+        self.player.inventory.clear()
+        self.assertEqual([self.timepiece], self.player.inventory)
+        self.assertTrue(self.player.has(self.timepiece))
+
+
+class TestPlaceDescription(GameTestCase):
+
+    def test__description__is_rendered_again__when_items_change(self):
+        game = Vampire()
+        place = game.player.location
+        self.assertEqual(
+            'A dark and spooky entrance hall.... You see:\nSign\nTimepiece\nAxe\nObvious exits are: East',
+            place.description,
+        )
+        self.assertIs(place.description, place.description)
+        place.remove_item(place.items.lookup('sign'))
+        self.assertEqual(
+            'A dark and spooky entrance hall.... You see:\nTimepiece\nAxe\nObvious exits are: East',
+            place.description,
+        )
+
+
+class TestPersistentContainerState(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+        self.hall = self.game.player.location
+        self.sign = self.hall.items.lookup('sign')
+        self.timepiece = self.hall.items.lookup('timepiece')
+        self.axe = self.hall.items.lookup('axe')
+
+    def test__snapshot_items__is_unaffected_by_later_changes(self):
+        snapshot = self.hall.snapshot_items()
+        self.hall.remove_item(self.timepiece)
+        self.assertEqual([self.sign, self.timepiece, self.axe], list(snapshot))
+        self.assertEqual([self.sign, self.axe], self.hall.inventory)
+
+    def test__restore_items__shares_snapshot_without_copying(self):
+        snapshot = self.hall.snapshot_items()
+        self.game.take_turn('get timepiece')
+        self.hall.restore_items(snapshot)
+        self.assertIs(snapshot.index, self.hall.items.snapshot().index)
+        self.assertTrue(self.hall.has(self.timepiece))
+
+    def test__inventory__keeps_order_items_were_added_in(self):
+        self.game.take_turn('get timepiece')
+        self.game.take_turn('drop timepiece')
+        self.assertEqual([self.sign, self.axe, self.timepiece], self.hall.inventory)
+        self.hall.remove_item(self.sign)
+        self.hall.add_item(self.sign)
+        self.assertEqual([self.axe, self.timepiece, self.sign], self.hall.inventory)
+
+    def test__inventory__keeps_order_items_were_added_in__when_items_move_many_times(self):
+        snapshot = self.hall.snapshot_items()
+        for _ in range(100):
+            self.game.take_turn('get timepiece')
+            self.game.take_turn('drop timepiece')
+        self.assertEqual([self.sign, self.axe, self.timepiece], self.hall.inventory)
+        self.hall.restore_items(snapshot)
+        self.hall.remove_item(self.sign)
+        self.hall.add_item(self.sign)
+        self.assertEqual([self.timepiece, self.axe, self.sign], self.hall.inventory)
@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+
+from game.text import tracing
+from game.text.vampire.game_controller import Vampire
+from tests import GameTestCase
+
+
+class TestTracing(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+        self.addCleanup(tracing.disable)
+
+    def test__span__records_nothing__when_tracing_is_disabled(self):
+        self.assertIsNone(tracing.disable())
+        with tracing.span('turn') as span:
+            self.assertIsNone(span)
+
+    def test__take_turn__records_span_for_each_phase__when_tracing_is_enabled(self):
+        tracer = tracing.enable()
+        self.game.take_turn('e')
+        names = [event['name'] for event in tracer.events]
+        self.assertEqual(['tokenize', 'lookup', 'validate', 'render', 'execute', 'turn'], names)
+        turn = tracer.events[-1]
+        self.assertEqual({'text': 'e'}, turn['args'])
+        self.assertTrue(all(turn['ts'] <= event['ts'] for event in tracer.events))
+
+    def test__write__exports_chrome_trace_event_json(self):
+        tracer = tracing.enable()
+        self.game.take_turn('look')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            tracer.write(path)
+            with open(path, encoding='utf-8') as trace_file:
+                trace = json.load(trace_file)
+        self.assertEqual({'X'}, {event['ph'] for event in trace['traceEvents']})
+        self.assertIn('dur', trace['traceEvents'][0])
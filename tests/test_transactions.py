@@ -0,0 +1,85 @@
+from game.text.results import OutcomeStatus
+from game.text.text_games import TextGameMultiPlayer
+from game.text.things import ThingAlreadyInIndexError
+from game.text.transactions import Transaction
+from game.text.vampire.game_controller import Vampire
+from game.text.vampire.items import Timepiece
+from tests import GameTestCase
+
+
+class TestTransaction(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+        self.hall = self.game.places.lookup('Entrance Hall')
+        self.library = self.game.places.lookup('Library')
+
+    def test__rollback__restores_changed_containers_and_player_location(self):
+        timepiece = self.hall.items.lookup('Timepiece')
+        with Transaction(self.game.player) as transaction:
+            self.game.player.get(timepiece)
+            self.game.player.location = self.library
+            self.assertEqual([self.hall, self.game.player], list(transaction.snapshots))
+            transaction.rollback()
+        self.assertIs(self.hall, self.game.player.location)
+        self.assertEqual(['Sign', 'Timepiece', 'Axe'], [item.name for item in self.hall.inventory])
+        self.assertEqual([], self.game.player.inventory)
+
+    def test__exit__rolls_back__when_error_is_raised(self):
+        try:
+            with Transaction():
+                self.library.remove_item(self.library.items.lookup('Crate'))
+                raise KeyError('Crate')
+        except KeyError:
+            pass
+        self.assertEqual(['Crate', 'Brick Fireplace'], [item.name for item in self.library.inventory])
+
+    def test__get__leaves_item_in_location__when_adding_it_to_inventory_fails(self):
+        self.game.player.add_item(Timepiece(self.game))
+        timepiece = self.hall.items.lookup('Timepiece')
+        self.assertRaises(ThingAlreadyInIndexError, self.game.player.get, timepiece)
+        self.assertTrue(self.hall.has(timepiece))
+
+
+class TestDryRun(GameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.game = Vampire()
+
+    def test__dry_run__returns_outcome_of_command_line__without_changing_game(self):
+        outcome = self.game.dry_run('get timepiece; e')
+        self.assertEqual(OutcomeStatus.OK, outcome.status)
+        self.assertEqual('Entrance Hall', self.game.player.location.name)
+        self.assertEqual([], self.game.player.inventory)
+        self.assertFalse(self.game.history.can_undo)
+
+    def test__dry_run__leaves_history_and_clock_unchanged__when_command_undoes_turn(self):
+        self.game.take_turn('get timepiece')
+        self.game.time += 5
+        self.assertEqual(OutcomeStatus.OK, self.game.dry_run('undo').status)
+        self.assertEqual(1, self.game.history.position)
+        self.assertEqual(485, self.game.time)
+        self.assertEqual(['Timepiece'], [item.name for item in self.game.player.inventory])
+        self.assertEqual('OK, undid "get timepiece"', str(self.game.take_turn('undo')))
+
+    def test__dry_run__leaves_history_unchanged__when_command_redoes_turn(self):
+        self.game.take_turn('get timepiece')
+        self.game.take_turn('undo')
+        self.assertEqual(OutcomeStatus.OK, self.game.dry_run('redo').status)
+        self.assertEqual(0, self.game.history.position)
+        self.assertEqual([], self.game.player.inventory)
+        self.assertTrue(self.game.history.can_redo)
+
+    def test__dry_run__returns_failed_outcome__when_command_would_fail(self):
+        self.assertEqual(OutcomeStatus.ACTION_FAILED, self.game.dry_run('drop timepiece').status)
+
+    def test__dry_run__announces_nothing_to_other_players(self):
+        world = TextGameMultiPlayer(self.game)
+        player, other_player = world.join('Alice'), world.join('Bob')
+        world.events.flush()
+        action, _ = self.game.grammar.parse('get timepiece')
+        self.assertEqual(OutcomeStatus.OK, action.dry_run(player).status)
+        self.assertEqual({}, world.events.flush())
+        self.assertFalse(player.has(self.game.places.lookup('Entrance Hall').items.lookup('Timepiece')))